@@ -1,4 +1,4 @@
-from utils.input import load_lines
+from utils.input import iter_lines
 
 
 def is_nice(line: str) -> bool:
@@ -14,7 +14,7 @@ def is_nice(line: str) -> bool:
 
 if __name__ == "__main__":
     nice_count = 0
-    for line in load_lines():
+    for line in iter_lines():
         if is_nice(line):
             nice_count += 1
     print(nice_count)
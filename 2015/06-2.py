@@ -1,19 +1,24 @@
 from typing import Tuple, Callable
 
+import numpy
+
+from utils.array_map2d import ArrayMap2D
+from utils.coords2d import Coords2D
 from utils.input import load_lines
 
 
 class Lights:
 
     def __init__(self):
-        self.grid = []
-        for row in range(1000):
-            self.grid.append([0] * 1000)
+        self.grid = ArrayMap2D(1000, 1000, 0)
 
-    def execute_cmd(self, start: Tuple[int, int], end: Tuple[int, int], cmd: Callable[[int], int]):
-        for x in range(start[0], end[0] + 1):
-            for y in range(start[1], end[1] + 1):
-                self.grid[x][y] = cmd(self.grid[x][y])
+    def execute_cmd(
+            self,
+            start: Tuple[int, int],
+            end: Tuple[int, int],
+            cmd: Callable[[numpy.ndarray], numpy.ndarray]
+    ):
+        self.grid.apply_region(Coords2D(*start), Coords2D(*end), cmd)
 
     def parse_line(self, line: str) -> None:
         line = line.replace("turn o", "turno")
@@ -23,13 +28,13 @@ class Lights:
         end = tuple(int(x) for x in end.split(","))
         cmd = {
             "turnon": lambda x: x+1,
-            "turnoff": lambda x: max(0, x-1),
+            "turnoff": lambda x: numpy.maximum(0, x-1),
             "toggle": lambda x: x+2
         }[cmd]
         self.execute_cmd(start, end, cmd)
 
     def sum(self) -> int:
-        return sum(sum(row) for row in self.grid)
+        return int(self.grid.map.sum())
 
 
 if __name__ == "__main__":
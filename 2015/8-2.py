@@ -1,6 +1,6 @@
 import re
 
-from utils.input import load_lines
+from utils.input import iter_lines
 
 
 def in_memory_size(line: str) -> int:
@@ -18,6 +18,6 @@ def embiggen(line: str) -> str:
 
 if __name__ == "__main__":
     total_diff = 0
-    for l in load_lines():
+    for l in iter_lines():
         total_diff += len(embiggen(l)) - len(l)
     print(total_diff)
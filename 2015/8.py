@@ -1,6 +1,6 @@
 import re
 
-from utils.input import load_lines
+from utils.input import iter_lines
 
 
 def in_memory_size(line: str) -> int:
@@ -12,6 +12,6 @@ def in_memory_size(line: str) -> int:
 
 if __name__ == "__main__":
     total_diff = 0
-    for l in load_lines():
+    for l in iter_lines():
         total_diff += len(l) - in_memory_size(l)
     print(total_diff)
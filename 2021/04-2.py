@@ -1,6 +1,6 @@
 from typing import List
 
-from utils.input import load_lines
+from utils.input import iter_blocks
 
 
 class BingoBoard:
@@ -44,25 +44,11 @@ def last_board_score(numbers: List[int], boards: List[BingoBoard]) -> int:
                 return card.sum() * num
 
 
-def construct_boards(lines: List[str]) -> List[BingoBoard]:
-    bingo_lines = []
-    bingo_boards = []
-    for line in lines:
-        if not line.strip() and bingo_lines:
-            bingo_boards.append(BingoBoard.from_lines(bingo_lines))
-            bingo_lines = []
-        else:
-            bingo_lines.append(line)
-    if bingo_lines:
-        bingo_boards.append(BingoBoard.from_lines(bingo_lines))
-    return bingo_boards
-
-
 if __name__ == "__main__":
-    my_input = load_lines()
-    called_numbers = [int(called_number) for called_number in my_input[0].split(",")]
+    input_blocks = iter_blocks()
+    called_numbers = [int(called_number) for called_number in next(input_blocks)[0].split(",")]
     # Construct boards
-    bingo_boards = construct_boards(my_input[2:])
+    bingo_boards = [BingoBoard.from_lines(block) for block in input_blocks]
     # Call numbers
     print(last_board_score(called_numbers, bingo_boards))
 
@@ -2,10 +2,11 @@ import dataclasses
 from typing import List
 
 from utils.input import load_lines
-from utils.coords2d import Coords2D, Line2D, Map2D
+from utils.array_map2d import ArrayMap2D
+from utils.coords2d import Coords2D, Line2D
 
 
-class Map(Map2D):
+class Map(ArrayMap2D[int]):
     def __init__(self, width: int, height: int) -> None:
         super().__init__(width, height, 0)
 
@@ -16,21 +17,7 @@ class Map(Map2D):
         )
 
     def num_overlaps(self, min_overlap: int = 2) -> int:
-        return sum(
-            sum(1 if val >= min_overlap else 0 for val in row)
-            for row in self.map
-        )
-
-    def add_line(self, line: "Line") -> None:
-        if line.vertical:
-            for y in range(line.min_y, line.max_y + 1):
-                self.map[y][line.start.x] += 1
-            return
-        if line.horizontal:
-            for x in range(line.min_x, line.max_x + 1):
-                self.map[line.start.y][x] += 1
-            return
-        raise NotImplementedError
+        return self.threshold(min_overlap).count(True)
 
 
 @dataclasses.dataclass
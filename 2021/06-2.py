@@ -1,19 +1,56 @@
-from collections import Counter
+from functools import lru_cache
+from typing import List
 
 from utils.input import load_input
+from utils.math import matrix_power, matrix_multiply, matrix_vector_multiply
+
+RESET_AGE = 6
+SPAWN_AGE = 8
+
+
+def transition_matrix() -> List[List[int]]:
+    """
+    Maps a count of fish at each age, from 0 to 8, to the counts a day later. transitions[new_age][old_age] is how many
+    fish of new_age each fish of old_age becomes: a fish at 0 resets to 6 and spawns a new fish at 8, others count down.
+    """
+    transitions = [[0] * (SPAWN_AGE + 1) for _ in range(SPAWN_AGE + 1)]
+    for age in range(1, SPAWN_AGE + 1):
+        transitions[age - 1][age] = 1
+    transitions[RESET_AGE][0] += 1
+    transitions[SPAWN_AGE][0] += 1
+    return transitions
+
+
+TRANSITIONS = transition_matrix()
+
+
+@lru_cache(maxsize=None)
+def transitions_after(days: int) -> List[List[int]]:
+    return matrix_power(TRANSITIONS, days)
+
+
+def age_counts(ages: List[int]) -> List[int]:
+    counts = [0] * (SPAWN_AGE + 1)
+    for age in ages:
+        counts[age] += 1
+    return counts
+
+
+def population_after(ages: List[int], days: int) -> int:
+    return sum(matrix_vector_multiply(transitions_after(days), age_counts(ages)))
+
+
+def populations_after(populations: List[List[int]], days: int) -> List[int]:
+    """
+    Works out the size of many starting populations at once, by multiplying with a matrix whose columns are their age
+    counts.
+    """
+    age_columns = [age_counts(ages) for ages in populations]
+    results = matrix_multiply(transitions_after(days), [list(row) for row in zip(*age_columns)])
+    return [sum(column) for column in zip(*results)]
+
 
 if __name__ == "__main__":
     population = load_input()
-    population = population.strip().replace(",", "")
-    population_ctr = Counter(int(x) for x in population)
-    for day in range(256):
-        population_ctr[9] = population_ctr.get(0, 0)
-        population_ctr[7] = population_ctr.get(7, 0) + population_ctr.get(0, 0)
-        if 0 in population_ctr:
-            del population_ctr[0]
-        new_counter = {}
-        for age, count in population_ctr.items():
-            new_counter[age - 1] = count
-        population_ctr = new_counter
-        print(f"After {day + 1} days: {sum(population_ctr.values())}")
-    print(sum(population_ctr.values()))
+    fish_ages = [int(age) for age in population.strip().split(",")]
+    print(population_after(fish_ages, 256))
@@ -1,7 +1,7 @@
 import dataclasses
 from typing import List, Set
 
-from utils.input import load_lines
+from utils.input import iter_lines
 
 
 @dataclasses.dataclass
@@ -147,7 +147,7 @@ def find_wiring(input_digits: List[str]) -> DisplayWiring:
 
 if __name__ == "__main__":
     total = 0
-    for line in load_lines():
+    for line in iter_lines():
         inp, results = line.split(" | ")
         wiring = find_wiring(inp.split())
         result_digits = []
@@ -1,8 +1,8 @@
-from utils.input import load_lines
+from utils.input import iter_lines
 
 if __name__ == "__main__":
     count = 0
-    for line in load_lines():
+    for line in iter_lines():
         inp, results = line.split(" | ")
         for result in results.split():
             if len(result) in [2, 4, 3, 7]:
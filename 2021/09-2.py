@@ -1,5 +1,6 @@
 from typing import List, Set
 
+from utils.array_map2d import ArrayMap2D
 from utils.coords2d import Map2D, Coords2D
 from utils.input import load_lines
 
@@ -34,12 +35,9 @@ class Grid(Map2D):
 
 
 def find_lowest_points(grid: Grid) -> List[Coords2D]:
-    low_points = []
-    for coords in grid.all_coords():
-        neighbours = grid.find_neighbours(coords)
-        if grid.get_value(coords) < min(grid.get_value(n) for n in neighbours):
-            low_points.append(coords)
-    return low_points
+    heights = ArrayMap2D.from_map(grid)
+    lower_than_neighbours = heights.map < heights.neighbour_min(fill=10).map
+    return list(ArrayMap2D.from_array(lower_than_neighbours).all_coords_with_value(True))
 
 
 def add_basin_points(
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from utils.input import load_lines
+from utils.input import iter_lines
 
 
 def find_closing_chars(input_line: str) -> Optional[str]:
@@ -42,7 +42,7 @@ def points_for_line(input_line: str) -> Optional[int]:
 
 if __name__ == "__main__":
     scores = []
-    for line in load_lines():
+    for line in iter_lines():
         line_score = points_for_line(line)
         if line_score is not None:
             scores.append(points_for_line(line))
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from utils.input import load_lines
+from utils.input import iter_lines
 
 
 def find_incorrect_char(input_line: str) -> Optional[str]:
@@ -33,6 +33,6 @@ def points_for_line(input_line: str) -> int:
 
 if __name__ == "__main__":
     total = 0
-    for line in load_lines():
+    for line in iter_lines():
         total += points_for_line(line)
     print(total)
@@ -1,56 +1,32 @@
 from typing import List
 
-from utils.coords2d import Map2D, Coords2D
+from utils.array_map2d import ArrayMap2D
 from utils.input import load_lines
 
 
 class OctopodeGrid:
     def __init__(self, input_lines: List[str]) -> None:
-        self.energy = Map2D.from_number_input(input_lines)
-        self.flashed = Map2D(self.energy.width, self.energy.height)
+        self.energy = ArrayMap2D.from_number_input(input_lines)
+        self.flashed = ArrayMap2D(self.energy.width, self.energy.height, False)
 
     @property
     def octopode(self) -> int:
         return self.energy.size
 
     def increase_energy_everywhere(self) -> None:
-        for coord in self.energy.all_coords():
-            self.increase_energy(coord)
-
-    def increase_energy(self, coords: Coords2D) -> None:
-        self.energy.set_value(coords, self.energy.get_value(coords) + 1)
-
-    def list_flashes(self) -> List[Coords2D]:
-        flashes = []
-        for coord in self.energy.all_coords():
-            if self.energy.get_value(coord) > 9 and not self.flashed.get_value(coord):
-                flashes.append(coord)
-        return flashes
-
-    def mark_flashed(self, coords: Coords2D) -> None:
-        self.flashed.set_value(coords, True)
-
-    def increase_neighbours(self, coords: Coords2D) -> None:
-        for coord in self.energy.valid_neighbours(coords, True):
-            if not self.flashed.get_value(coord):
-                self.increase_energy(coord)
+        self.energy.add(1)
 
     def flashes(self) -> int:
-        flashes = 0
         while True:
-            new_flashes = self.list_flashes()
-            if not new_flashes:
-                return flashes
-            for flash in new_flashes:
-                self.mark_flashed(flash)
-                self.increase_neighbours(flash)
-                flashes += 1
+            new_flashes = self.energy.threshold(10).map & ~self.flashed.map
+            if not new_flashes.any():
+                return self.flashed.count(True)
+            self.flashed.map |= new_flashes
+            self.energy.map += ArrayMap2D.from_array(new_flashes).neighbour_sum(True).map
 
     def reset_flashes(self) -> None:
-        self.flashed = Map2D(self.flashed.width, self.flashed.height, False)
-        for coord in self.energy.all_coords():
-            if self.energy.get_value(coord) > 9:
-                self.energy.set_value(coord, 0)
+        self.energy.map[self.flashed.map] = 0
+        self.flashed.fill(False)
 
     def render(self) -> str:
         return "\n".join(
@@ -1,54 +1,80 @@
-from collections import defaultdict
-from typing import List, Dict, Set
+from functools import lru_cache
+from typing import List, Dict, Iterator, Tuple
 
 from utils.input import load_lines
 
 
-def is_valid_path(path: List[str]) -> bool:
-    small_caves = [cave for cave in path if cave.islower()]
-    return len(small_caves) <= len(set(small_caves)) + 1
+class CaveGraph:
+    """
+    Counts paths through the caves by memoised search over (cave, visited small caves bitmask, revisit used).
+    """
 
+    def __init__(self, links: List[Tuple[str, str]]) -> None:
+        self.names: List[str] = sorted({cave for link in links for cave in link})
+        self.ids: Dict[str, int] = {name: cave_id for cave_id, name in enumerate(self.names)}
+        self.small_masks: List[int] = [
+            1 << cave_id if name.islower() else 0 for cave_id, name in enumerate(self.names)
+        ]
+        neighbours: List[List[int]] = [[] for _ in self.names]
+        for one, two in links:
+            neighbours[self.ids[one]].append(self.ids[two])
+            neighbours[self.ids[two]].append(self.ids[one])
+        self.start = self.ids["start"]
+        self.end = self.ids["end"]
+        # Paths never return to the start
+        self.neighbours: List[Tuple[int, ...]] = [
+            tuple(cave_id for cave_id in cave_neighbours if cave_id != self.start) for cave_neighbours in neighbours
+        ]
 
-def is_complete_path(path: List[str]) -> bool:
-    return path[0] == "start" and path[-1] == "end"
+    @classmethod
+    def parse_input(cls, input_lines: List[str]) -> "CaveGraph":
+        links = []
+        for line in input_lines:
+            start, end = line.split("-")
+            links.append((start, end))
+        return cls(links)
 
+    def count_paths(self, allow_revisit: bool = False) -> int:
+        """
+        Counts the paths from start to end which visit small caves at most once, except that if allow_revisit is set,
+        one small cave may be visited twice.
+        """
+        @lru_cache(maxsize=None)
+        def count_from(cave_id: int, visited: int, revisit_used: bool) -> int:
+            if cave_id == self.end:
+                return 1
+            total = 0
+            for next_id in self.neighbours[cave_id]:
+                mask = self.small_masks[next_id]
+                if visited & mask:
+                    if not revisit_used:
+                        total += count_from(next_id, visited, True)
+                else:
+                    total += count_from(next_id, visited | mask, revisit_used)
+            return total
 
-def find_paths(links: Dict[str, Set[str]], start_path: List[str]) -> List[List[str]]:
-    if is_complete_path(start_path):
-        return []
-    paths = []
-    last_cave = start_path[-1]
-    for next_cave in links[last_cave]:
-        if is_valid_path(start_path + [next_cave]):
-            paths.append(start_path + [next_cave])
-    return paths
+        return count_from(self.start, self.small_masks[self.start], not allow_revisit)
 
-
-def find_all_paths(links: Dict[str, Set[str]]) -> List[List[str]]:
-    paths = []
-    new_paths = find_paths(link_map, ["start"])
-    while True:
-        try_next = []
-        for path in new_paths:
-            found = find_paths(links, path)
-            if found:
-                try_next.extend(found)
-                paths.extend([path for path in found if is_complete_path(path)])
-        if not try_next:
-            return paths
-        new_paths = try_next
+    def iter_paths(self, allow_revisit: bool = False) -> Iterator[List[str]]:
+        """
+        Lazily yields each path counted by count_paths(), as a list of cave names.
+        """
+        stack = [(self.start, self.small_masks[self.start], not allow_revisit, [self.start])]
+        while stack:
+            cave_id, visited, revisit_used, path = stack.pop()
+            if cave_id == self.end:
+                yield [self.names[path_id] for path_id in path]
+                continue
+            for next_id in self.neighbours[cave_id]:
+                mask = self.small_masks[next_id]
+                if visited & mask:
+                    if not revisit_used:
+                        stack.append((next_id, visited, True, path + [next_id]))
+                else:
+                    stack.append((next_id, visited | mask, revisit_used, path + [next_id]))
 
 
 if __name__ == "__main__":
     my_input = load_lines()
-    link_map = defaultdict(lambda: set())
-    for line in my_input:
-        start, end = line.split("-")
-        if end != "start":
-            link_map[start].add(end)
-        if start != "start":
-            link_map[end].add(start)
-    total_paths = find_all_paths(link_map)
-    for p in total_paths:
-        print(p)
-    print(len(total_paths))
+    graph = CaveGraph.parse_input(my_input)
+    print(graph.count_paths(allow_revisit=True))
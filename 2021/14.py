@@ -1,24 +1,63 @@
 from collections import Counter
+import typing
 from typing import Dict, List
 
+import numpy
+
 from utils.input import load_lines
+from utils.math import matrix_power, matrix_vector_multiply
+
+
+class PolymerEngine:
+    """
+    Advances counts of adjacent element pairs by powers of the pair transition matrix.
+    """
+
+    def __init__(self, extensions: Dict[str, str]) -> None:
+        self.extensions = extensions
+        self.pairs: List[str] = sorted(
+            set(extensions) | {pair[0] + ext for pair, ext in extensions.items()} | {
+                ext + pair[1] for pair, ext in extensions.items()
+            }
+        )
+        self.pair_ids = {pair: pair_id for pair_id, pair in enumerate(self.pairs)}
+        # transitions[new][old] is how many of the new pair each old pair turns into in one step
+        self.transitions = numpy.zeros((len(self.pairs), len(self.pairs)), dtype=numpy.int64)
+        for pair, pair_id in self.pair_ids.items():
+            if pair not in extensions:
+                self.transitions[pair_id, pair_id] += 1
+                continue
+            self.transitions[self.pair_ids[pair[0] + extensions[pair]], pair_id] += 1
+            self.transitions[self.pair_ids[extensions[pair] + pair[1]], pair_id] += 1
 
+    def pair_counts(self, polymer: str) -> List[int]:
+        counts = [0] * len(self.pairs)
+        for index in range(len(polymer) - 1):
+            counts[self.pair_ids[polymer[index:index + 2]]] += 1
+        return counts
 
-def extend_polymer(polymer: List[str], extensions: Dict[str, str]) -> List[str]:
-    for index in range(len(polymer) - 1, 0, -1):
-        key = polymer[index - 1] + polymer[index]
-        polymer.insert(index, extensions[key])
-    return polymer
+    def element_counts(self, polymer: str, steps: int) -> typing.Counter[str]:
+        # Each step at most doubles the number of pairs, so past int64 range this uses exact python ints
+        if steps + (len(polymer) - 1).bit_length() >= 63:
+            pair_counts = matrix_vector_multiply(
+                matrix_power(self.transitions.tolist(), steps), self.pair_counts(polymer)
+            )
+        else:
+            transitions = numpy.linalg.matrix_power(self.transitions, steps)
+            pair_counts = (transitions @ numpy.array(self.pair_counts(polymer))).tolist()
+        element_counts = Counter()
+        for pair, count in zip(self.pairs, pair_counts):
+            element_counts[pair[1]] += count
+        # Every element but the first is the second of a pair, and the first element never changes
+        element_counts[polymer[0]] += 1
+        return element_counts
 
 
 if __name__ == "__main__":
     my_input = load_lines()
-    input_polymer = list(my_input[0])
     ext_map = {
         l.split(" -> ")[0]: l.split(" -> ")[1] for l in my_input[2:]
     }
-    for step in range(10):
-        extend_polymer(input_polymer, ext_map)
-    c = Counter(input_polymer)
-    most_common = c.most_common()
+    engine = PolymerEngine(ext_map)
+    most_common = engine.element_counts(my_input[0], 10).most_common()
     print(most_common[0][1] - most_common[-1][1])
@@ -1,92 +1,84 @@
-from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
 import dataclasses
 import datetime
+from functools import cached_property
 import itertools
-from typing import List, Dict, Tuple, Set, Optional
+from typing import List, Dict, Tuple, Set, Optional, FrozenSet, Iterable
 
 from utils.coords3d import Coords3D
 from utils.input import load_input
 
 
-class Transformation3D(ABC):
+def permutation_parity(order: Tuple[int, ...]) -> int:
+    inversions = sum(1 for i, j in itertools.combinations(range(len(order)), 2) if order[i] > order[j])
+    return -1 if inversions % 2 else 1
 
-    @abstractmethod
-    def apply_transformation(self, coord: Coords3D) -> Coords3D:
-        raise NotImplementedError
 
-    @abstractmethod
-    def __neg__(self) -> "Transformation3D":
-        raise NotImplementedError
+# The 24 proper rotations, each as the axis which each output axis is read from, and the sign it is multiplied by.
+# The other 24 flip and permutation combinations are reflections, which no scanner can be turned into.
+ROTATIONS: List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]] = [
+    (axes, signs)
+    for axes in itertools.permutations(range(3))
+    for signs in itertools.product((1, -1), repeat=3)
+    if permutation_parity(axes) * signs[0] * signs[1] * signs[2] == 1
+]
 
 
-@dataclasses.dataclass(eq=True, frozen=True)
-class Flip3D(Transformation3D):
-    coord_flip: int
+def _rotate(index: int, coord: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    axes, signs = ROTATIONS[index]
+    return signs[0] * coord[axes[0]], signs[1] * coord[axes[1]], signs[2] * coord[axes[2]]
 
-    def apply_transformation(self, coord: Coords3D) -> Coords3D:
-        x_flip = (2 * (self.coord_flip % 2)) - 1
-        y_flip = (2 * (self.coord_flip // 2 % 2)) - 1
-        z_flip = (2 * (self.coord_flip // 4 % 2)) - 1
-        return Coords3D(
-            x_flip * coord.x,
-            y_flip * coord.y,
-            z_flip * coord.z
-        )
 
-    def __neg__(self) -> "Rotation3D":
-        return Flip3D(
-            self.coord_flip
-        )
+# A rotation is identified by where it sends a point with distinct, non-zero coordinates
+_ROTATION_BY_IMAGE = {_rotate(index, (1, 2, 3)): index for index in range(len(ROTATIONS))}
+IDENTITY_ROTATION = _ROTATION_BY_IMAGE[(1, 2, 3)]
+# ROTATION_COMPOSE[first][second] is the single rotation equal to applying first, then second
+ROTATION_COMPOSE: List[List[int]] = [
+    [_ROTATION_BY_IMAGE[_rotate(second, _rotate(first, (1, 2, 3)))] for second in range(len(ROTATIONS))]
+    for first in range(len(ROTATIONS))
+]
+ROTATION_INVERSE: List[int] = [row.index(IDENTITY_ROTATION) for row in ROTATION_COMPOSE]
 
 
 @dataclasses.dataclass(eq=True, frozen=True)
-class Rotation3D(Transformation3D):
-    coord_order: str
+class Rotation3D:
+    index: int
 
     def apply_transformation(self, coord: Coords3D) -> Coords3D:
-        return Coords3D(
-            coord.__getattribute__(self.coord_order[0]),
-            coord.__getattribute__(self.coord_order[1]),
-            coord.__getattribute__(self.coord_order[2])
-        )
+        return Coords3D(*_rotate(self.index, coord))
 
-    def __neg__(self) -> "Rotation3D":
-        new_order = {
-            "xyz": "xyz",
-            "xzy": "xzy",
-            "yxz": "yxz",
-            "yzx": "zxy",
-            "zxy": "yzx",
-            "zyx": "zyx",
-        }[self.coord_order]
-        return Rotation3D(new_order)
-
-
-@dataclasses.dataclass(eq=True, frozen=True)
-class Translate3D:
-    coord: Coords3D
-
-    def apply_transformation(self, coord: Coords3D) -> Coords3D:
-        return coord + self.coord
+    def then(self, other: "Rotation3D") -> "Rotation3D":
+        return Rotation3D(ROTATION_COMPOSE[self.index][other.index])
 
-    def __neg__(self) -> Coords3D:
-        return Translate3D(-self.coord)
+    def __neg__(self) -> "Rotation3D":
+        return Rotation3D(ROTATION_INVERSE[self.index])
 
 
 @dataclasses.dataclass(eq=True, frozen=True)
 class CompoundTransformation:
-    transformations: Tuple[Transformation3D]
+    """
+    A rotation followed by a translation. Any chain of these collapses into a single one, so a scanner's position
+    relative to scanner 0 is always one of these, however many scanners it was found through.
+    """
+    rotation: Rotation3D
+    translation: Coords3D
+
+    @classmethod
+    def identity(cls) -> "CompoundTransformation":
+        return cls(Rotation3D(IDENTITY_ROTATION), Coords3D(0, 0, 0))
 
     def apply(self, coords: Coords3D) -> Coords3D:
-        for trans in self.transformations:
-            coords = trans.apply_transformation(coords)
-        return coords
+        return self.rotation.apply_transformation(coords) + self.translation
+
+    def then(self, other: "CompoundTransformation") -> "CompoundTransformation":
+        return CompoundTransformation(
+            self.rotation.then(other.rotation),
+            other.apply(self.translation)
+        )
 
     def __neg__(self) -> "CompoundTransformation":
-        transformations = []
-        for trans in self.transformations[::-1]:
-            transformations.append(-trans)
-        return CompoundTransformation(tuple(transformations))
+        inverse = -self.rotation
+        return CompoundTransformation(inverse, -inverse.apply_transformation(self.translation))
 
 
 def translate_beacons(beacons: Set[Coords3D], translation: Coords3D) -> Set[Coords3D]:
@@ -103,17 +95,19 @@ def transform_beacons(beacons: Set[Coords3D], transformation: CompoundTransforma
     }
 
 
-def all_transformations(beacons: Set[Coords3D]) -> Dict[CompoundTransformation, Set[Coords3D]]:
+def all_transformations(beacons: Set[Coords3D]) -> Dict[Rotation3D, Set[Coords3D]]:
     results = {}
-    for coord_order in itertools.permutations("xyz", 3):
-        for coord_flip in range(8):
-            rotation = Rotation3D("".join(coord_order))
-            flip = Flip3D(coord_flip)
-            transformation = CompoundTransformation((rotation, flip))
-            results[transformation] = transform_beacons(beacons, transformation)
+    for index in range(len(ROTATIONS)):
+        rotation = Rotation3D(index)
+        results[rotation] = {rotation.apply_transformation(beacon) for beacon in beacons}
     return results
 
 
+def distance_squared(one: Coords3D, two: Coords3D) -> int:
+    diff = one - two
+    return diff.x * diff.x + diff.y * diff.y + diff.z * diff.z
+
+
 def truncate_beacons(beacons: Set[Coords3D], max_distance: int = 1000) -> Set[Coords3D]:
     return {
         beacon
@@ -127,10 +121,11 @@ def truncate_beacons(beacons: Set[Coords3D], max_distance: int = 1000) -> Set[Co
 
 
 class Scanner:
-    def __init__(self, number: int, beacons: Set[Coords3D], transforms: List[CompoundTransformation] = None) -> None:
+    def __init__(self, number: int, beacons: Set[Coords3D], transform: CompoundTransformation = None) -> None:
         self.number = number
         self.beacons = beacons
-        self.transforms = transforms
+        # Maps this scanner's coordinates to scanner 0's, once known
+        self.transform = transform
 
     @classmethod
     def parse_input(cls, scanner_lines: List[str]) -> "Scanner":
@@ -146,51 +141,70 @@ class Scanner:
     def __hash__(self) -> int:
         return hash((Scanner, self.number))
 
+    @cached_property
+    def beacon_fingerprints(self) -> Dict[Coords3D, FrozenSet[int]]:
+        """
+        For each beacon, the squared distances to every other beacon this scanner sees. These are unchanged by rotation
+        and translation, so the same beacon has much the same fingerprint from any scanner which sees it.
+        """
+        return {
+            beacon: frozenset(distance_squared(beacon, other) for other in self.beacons if other != beacon)
+            for beacon in self.beacons
+        }
+
+    @cached_property
+    def fingerprint(self) -> Counter:
+        return Counter(
+            distance_squared(one, two) for one, two in itertools.combinations(self.beacons, 2)
+        )
+
+    def might_overlap(self, other: "Scanner", min_beacons: int = 12) -> bool:
+        shared_distances = sum((self.fingerprint & other.fingerprint).values())
+        return shared_distances >= min_beacons * (min_beacons - 1) // 2
+
+    def beacon_correspondences(
+            self,
+            other: "Scanner",
+            min_beacons: int = 12
+    ) -> Iterable[Tuple[Coords3D, Coords3D]]:
+        """
+        Yields pairs of beacons, one from each scanner, whose fingerprints share enough distances that they could be
+        the same beacon in an overlap of at least min_beacons beacons.
+        """
+        beacons_by_distance: Dict[int, List[Coords3D]] = defaultdict(list)
+        for their_beacon, distances in other.beacon_fingerprints.items():
+            for distance in distances:
+                beacons_by_distance[distance].append(their_beacon)
+        for my_beacon, distances in self.beacon_fingerprints.items():
+            matches = Counter(
+                their_beacon
+                for distance in distances
+                for their_beacon in beacons_by_distance.get(distance, [])
+            )
+            for their_beacon, shared in matches.most_common():
+                if shared < min_beacons - 1:
+                    break
+                yield my_beacon, their_beacon
+
+    @cached_property
+    def rotated_beacons(self) -> Dict[Rotation3D, Set[Coords3D]]:
+        return all_transformations(self.beacons)
+
     def overlap_point(self, other: "Scanner") -> Optional[CompoundTransformation]:
-        for my_beacon in self.beacons:
-            for their_beacon in other.beacons:
-                my_beacons = translate_beacons(self.beacons, -my_beacon)
-                for transformation, my_transform_beacons in all_transformations(my_beacons).items():
-                    my_mapped_beacons = translate_beacons(my_transform_beacons, their_beacon)
-
-                    my_intersect_beacons = my_mapped_beacons.intersection(other.beacons)
-                    if len(my_intersect_beacons) < 12:
-                        continue
-                    else:
-                        return CompoundTransformation(
-                            (
-                                Translate3D(-my_beacon),
-                                *transformation.transformations,
-                                Translate3D(their_beacon)
-                            )
-                        )
-
-                    if False:
-                        my_intersect_beacons = truncate_beacons(my_mapped_beacons)
-                        if len(my_intersect_beacons) < 12:
-                            continue
-                        if not my_intersect_beacons.issubset(other.beacons):
-                            continue
-
-                        their_beacons = translate_beacons(other.beacons, -their_beacon)
-                        their_rotate_beacons = rotate_beacons(their_beacons, -rotation)
-                        their_mapped_beacons = translate_beacons(their_rotate_beacons, my_beacon)
-                        their_intersect_beacons = truncate_beacons(their_mapped_beacons)
-                        if len(their_intersect_beacons) < 12:
-                            continue
-                        if not their_intersect_beacons.issubset(self.beacons):
-                            continue
-
-                        print(f"Overlap between {self.number} and {other.number}. {len(my_intersect_beacons)}, {len(their_intersect_beacons)} beacons")
-                        if len(my_intersect_beacons) == len(their_intersect_beacons):
-                            return my_beacon - rotation.rotate_coord(their_beacon), rotation
-                        print(f"NON EQUAL OVERLAP???")
+        if not self.might_overlap(other):
+            return None
+        for my_beacon, their_beacon in self.beacon_correspondences(other):
+            for rotation, my_rotated_beacons in self.rotated_beacons.items():
+                translation = their_beacon - rotation.apply_transformation(my_beacon)
+                my_mapped_beacons = translate_beacons(my_rotated_beacons, translation)
+                if len(my_mapped_beacons.intersection(other.beacons)) >= 12:
+                    return CompoundTransformation(rotation, translation)
         return None
 
 
 def find_overlaps(scanners: List[Scanner]) -> None:
-    unknown_scanners = [scanner for scanner in scanners if scanner.transforms is None]
-    newly_known = {scanner for scanner in scanners if scanner.transforms is not None}
+    unknown_scanners = [scanner for scanner in scanners if scanner.transform is None]
+    newly_known = {scanner for scanner in scanners if scanner.transform is not None}
     while newly_known:
         print("Searching again")
         try_next = set()
@@ -200,11 +214,11 @@ def find_overlaps(scanners: List[Scanner]) -> None:
                     continue
                 print(f"Checking {known_scanner.number} against {unknown_scanner.number}")
                 if transform := known_scanner.overlap_point(unknown_scanner):
-                    unknown_scanner.transforms = known_scanner.transforms + [transform]
+                    unknown_scanner.transform = (-transform).then(known_scanner.transform)
                     print(f"Scanner {known_scanner.number} and {unknown_scanner.number} overlap!")
                     try_next.add(unknown_scanner)
         newly_known = try_next
-        unknown_scanners = [scanner for scanner in scanners if scanner.transforms is None]
+        unknown_scanners = [scanner for scanner in scanners if scanner.transform is None]
 
 
 def _main() -> str:
@@ -225,20 +239,17 @@ def _main() -> str:
 
 
     # Find overlaps
-    scanners[0].transforms = []
+    scanners[0].transform = CompoundTransformation.identity()
     find_overlaps(scanners)
     # Find scanner coords
     scanner_coords = {}
     for scanner in scanners:
-        coords = Coords3D(0,0,0)
-        for tf in scanner.transforms[::-1]:
-            coords = (-tf).apply(coords)
-        scanner_coords[scanner.number] = coords
+        scanner_coords[scanner.number] = scanner.transform.apply(Coords3D(0, 0, 0))
     # Get all diffs
     distances = []
     for coords1 in scanner_coords.values():
         for coords2 in scanner_coords.values():
-            distances.append(coords1.manhatten_distance(coords2))
+            distances.append(coords1.manhattan_distance(coords2))
     return str(max(distances))
 
 
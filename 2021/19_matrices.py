@@ -116,7 +116,7 @@ class CompoundTransformation:
 
     @cached_property
     def matrix(self) -> numpy.array:
-        result = numpy.identity(4)
+        result = numpy.identity(4, dtype=int)
         for trans in self.transformations[::-1]:
             result = numpy.matmul(result, trans.matrix)
         return result
@@ -126,6 +126,15 @@ class CompoundTransformation:
         result = numpy.matmul(self.matrix, coord_array)
         return Coords3D(result[0], result[1], result[2])
 
+    def apply_array(self, coord_array: numpy.array) -> numpy.array:
+        """
+        Transforms an (N, 4) array of homogeneous coordinates, one per row, in a single matrix multiplication.
+        """
+        return numpy.matmul(coord_array, self.matrix.T)
+
+    def then(self, other: "CompoundTransformation") -> "CompoundTransformation":
+        return CompoundTransformation(self.transformations + other.transformations)
+
     def __neg__(self) -> "CompoundTransformation":
         transformations: List[Transformation3D] = []
         for trans in self.transformations[::-1]:
@@ -133,11 +142,16 @@ class CompoundTransformation:
         return CompoundTransformation(tuple(transformations))
 
 
+def beacons_to_array(beacons: Set[Coords3D]) -> numpy.array:
+    return numpy.array([[beacon.x, beacon.y, beacon.z, 1] for beacon in beacons], dtype=int).reshape(-1, 4)
+
+
+def array_to_beacons(coord_array: numpy.array) -> Set[Coords3D]:
+    return {Coords3D(x, y, z) for x, y, z in coord_array[:, :3].tolist()}
+
+
 def transform_beacons(beacons: Set[Coords3D], transformation: CompoundTransformation) -> Set[Coords3D]:
-    return {
-        transformation.apply(beacon)
-        for beacon in beacons
-    }
+    return array_to_beacons(transformation.apply_array(beacons_to_array(beacons)))
 
 
 def all_transformations() -> List[Tuple[Rotation3D, Flip3D]]:
@@ -150,6 +164,17 @@ def all_transformations() -> List[Tuple[Rotation3D, Flip3D]]:
     return results
 
 
+# The 24 proper rotations (det == 1)
+PROPER_ROTATIONS = [
+    (rotate, flip)
+    for rotate, flip in all_transformations()
+    if round(numpy.linalg.det(CompoundTransformation((rotate, flip)).matrix)) == 1
+]
+PROPER_ROTATION_MATRICES = numpy.stack([
+    CompoundTransformation((rotate, flip)).matrix for rotate, flip in PROPER_ROTATIONS
+])
+
+
 def truncate_beacons(beacons: Set[Coords3D], max_distance: int = 1000) -> Set[Coords3D]:
     return {
         beacon
@@ -182,33 +207,24 @@ class Scanner:
     def __hash__(self) -> int:
         return hash((Scanner, self.number))
 
-    def overlap_point(self, other: "Scanner") -> Optional[CompoundTransformation]:
-        for my_beacon in self.beacons:
-            for their_beacon in other.beacons:
-                for rotate, flip in all_transformations():
-                    compound_tf = CompoundTransformation(
-                        (
-                            Translate3D(-my_beacon),
-                            rotate,
-                            flip,
-                            Translate3D(their_beacon)
-                        )
-                    )
-                    my_mapped_beacons = transform_beacons(self.beacons, compound_tf)
-
-                    my_intersect_beacons = my_mapped_beacons.intersection(other.beacons)
-                    if len(my_intersect_beacons) < 12:
-                        continue
-                    else:
-                        return CompoundTransformation(
-                            (
-                                Translate3D(-my_beacon),
-                                rotate,
-                                flip,
-                                Translate3D(their_beacon)
-                            )
-                        )
-
+    @cached_property
+    def beacon_array(self) -> numpy.array:
+        return beacons_to_array(self.beacons)
+
+    def overlap_point(self, other: "Scanner", min_beacons: int = 12) -> Optional[CompoundTransformation]:
+        """
+        For each rotation, every difference between one of their beacons and one of my rotated beacons is a candidate
+        translation, and the translation which lines up the most beacons is found by counting the unique differences.
+        """
+        their_beacons = other.beacon_array[:, :3]
+        rotated_beacons = numpy.matmul(self.beacon_array, PROPER_ROTATION_MATRICES.transpose(0, 2, 1))[:, :, :3]
+        for (rotate, flip), my_beacons in zip(PROPER_ROTATIONS, rotated_beacons):
+            differences = (their_beacons[:, numpy.newaxis, :] - my_beacons[numpy.newaxis, :, :]).reshape(-1, 3)
+            translations, counts = numpy.unique(differences, axis=0, return_counts=True)
+            best = counts.argmax()
+            if counts[best] >= min_beacons:
+                translation = Coords3D(*translations[best].tolist())
+                return CompoundTransformation((rotate, flip, Translate3D(translation)))
         return None
 
 
@@ -271,13 +287,13 @@ def _main() -> str:
     scanners[0].transforms = []
     find_overlaps(scanners)
     # Gather all coordinates
-    all_coords = scanners[0].beacons
+    all_coords = [scanners[0].beacon_array]
     for scanner in scanners[1:]:
-        zeroed_coords = scanner.beacons
+        to_origin = CompoundTransformation(())
         for tf in scanner.transforms[::-1]:
-            zeroed_coords = transform_beacons(zeroed_coords, -tf)
-        all_coords = all_coords.union(zeroed_coords)
-    return str(len(all_coords))
+            to_origin = to_origin.then(-tf)
+        all_coords.append(to_origin.apply_array(scanner.beacon_array))
+    return str(len(numpy.unique(numpy.concatenate(all_coords), axis=0)))
 
 
 if __name__ == "__main__":
@@ -1,15 +1,21 @@
 import datetime
 from typing import List
 
-from utils.coords2d import Map2D, Coords2D
-from utils.input import load_input
+import numpy
 
+from utils.array_map2d import InfiniteMap2D
+from utils.coords2d import Coords2D
+from utils.input import iter_blocks
 
-class InfiniteImage(Map2D[bool]):
+
+class InfiniteImage(InfiniteMap2D[bool]):
 
     def __init__(self, width: int, height: int, fill: bool = False, off_side: bool = False):
-        super().__init__(width, height, fill=fill)
-        self.off_side = off_side
+        super().__init__(width, height, fill=fill, background=off_side)
+
+    @property
+    def off_side(self) -> bool:
+        return self.background
 
     def render(self) -> str:
         return "\n".join(
@@ -24,18 +30,8 @@ def coords_to_binary_num(img: InfiniteImage, coords: List[Coords2D]) -> int:
 
 
 def enhance(image: InfiniteImage, lookup: str) -> InfiniteImage:
-    new_off_side = lookup[0] == "#"
-    if image.off_side:
-        new_off_side = lookup[9] == "#"
-    new_image = InfiniteImage(image.width + 2, image.height + 2, off_side=new_off_side)
-    offset = Coords2D(1, 1)
-    for coord in new_image.all_coords():
-        old_coord = coord - offset
-        neighbours = old_coord.list_neighbours(True) + [old_coord]
-        binary = coords_to_binary_num(image, neighbours)
-        if lookup[binary] == "#":
-            new_image.set_value(coord, True)
-    return new_image
+    image.step_lookup(numpy.array([char == "#" for char in lookup]))
+    return image
 
 
 def _test() -> None:
@@ -51,8 +47,8 @@ def _test() -> None:
 
 
 def _main() -> str:
-    scale_factor, image = load_input().split("\n\n")
-    image = InfiniteImage.from_bool_input(image.split("\n"), "#")
+    (scale_factor,), image_lines = iter_blocks()
+    image = InfiniteImage.from_bool_input(image_lines, "#")
     for step in range(50):
         image = enhance(image, scale_factor)
         print(image.render())
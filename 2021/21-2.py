@@ -1,98 +1,105 @@
+from collections import Counter, defaultdict
 import datetime
+import itertools
 import string
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Tuple
 
 from utils.input import load_lines
 from utils.math import wrap
 
 
+def roll_totals(dice_sides: int, rolls: int) -> Dict[int, int]:
+    """
+    Counts how many universes each total of a turn's rolls comes up in.
+    """
+    return dict(Counter(sum(roll) for roll in itertools.product(range(1, dice_sides + 1), repeat=rolls)))
+
+
 class Board:
-    def __init__(self, player_locations: Dict[int, int]):
-        self.places = 10
-        self.dice_sides = 3
-        self.states = [BoardState(player_locations[1], player_locations[2], 0, 0)]
+    def __init__(
+            self,
+            player_locations: Dict[int, int],
+            target_score: int = 21,
+            places: int = 10,
+            dice_sides: int = 3,
+            rolls: int = 3
+    ):
+        self.places = places
+        self.target_score = target_score
+        self.roll_totals = roll_totals(dice_sides, rolls)
+        self.player_locations = player_locations
         self.games_won = {player: 0 for player in player_locations.keys()}
 
-    def player_turn(self, player: int) -> None:
-        new_locations = {
-            3: 1,
-            4: 3,
-            5: 6,
-            6: 7,
-            7: 6,
-            8: 3,
-            9: 1
-        }
-        new_states = []
-        for move, count in new_locations.items():
-            for state in self.states:
-                new_state = state.with_player_turn(player, move, count)
-                if new_state.game_won():
-                    self.games_won[new_state.winning_player()] += new_state.count
-                else:
-                    new_states.append(new_state)
-        self.states = new_states
-
-    def games_over(self) -> bool:
-        return not self.states
+    def play(self) -> None:
+        """
+        Universes which reach the same positions and scores, with the same player to move, play out the same from then
+        on, so they are merged into one state with a count of universes. Every turn raises the total score, so states
+        are worked through in order of total score, and each is expanded only once, with every universe that reaches it.
+        """
+        start = BoardState(self.player_locations[1], self.player_locations[2], 0, 0)
+        states_by_total: List[Dict[Tuple[BoardState, int], int]] = [
+            defaultdict(int) for _ in range(2 * self.target_score)
+        ]
+        states_by_total[0][(start, 1)] = 1
+        for states in states_by_total:
+            for (state, player), count in states.items():
+                for move, move_count in self.roll_totals.items():
+                    new_state = state.with_player_turn(player, move, self.places)
+                    universes = count * move_count
+                    if new_state.game_won(self.target_score):
+                        self.games_won[new_state.winning_player()] += universes
+                    else:
+                        total = new_state.p1_score + new_state.p2_score
+                        states_by_total[total][(new_state, 3 - player)] += universes
 
     @classmethod
-    def parse_input(cls, input_lines: List[str]) -> "Board":
+    def parse_input(cls, input_lines: List[str], **kwargs) -> "Board":
         player_locations = {}
         for line in input_lines:
             first, second = line.split(": ")
             player_num = int(first.strip(string.ascii_letters + string.whitespace))
             player_loc = int(second)
             player_locations[player_num] = player_loc
-        return cls(player_locations)
+        return cls(player_locations, **kwargs)
 
 
-class BoardState:
-    def __init__(self, p1_loc: int, p2_loc: int, p1_score: int, p2_score: int, count: int = 1):
-        self.p1_loc = p1_loc
-        self.p2_loc = p2_loc
-        self.p1_score = p1_score
-        self.p2_score = p2_score
-        self.count = count
+class BoardState(NamedTuple):
+    p1_loc: int
+    p2_loc: int
+    p1_score: int
+    p2_score: int
 
-    def game_won(self) -> bool:
-        return max([self.p1_score, self.p2_score]) >= 21
+    def game_won(self, target_score: int = 21) -> bool:
+        return max([self.p1_score, self.p2_score]) >= target_score
 
     def winning_player(self) -> int:
         return 1 if self.p1_score > self.p2_score else 2
 
-    def with_player_turn(self, player: int, move: int, count: int) -> "BoardState":
+    def with_player_turn(self, player: int, move: int, places: int = 10) -> "BoardState":
         if player == 1:
-            new_position = wrap(self.p1_loc + move, 10)
+            new_position = wrap(self.p1_loc + move, places)
             new_score = self.p1_score + new_position
             return BoardState(
                 new_position,
                 self.p2_loc,
                 new_score,
-                self.p2_score,
-                self.count * count
+                self.p2_score
             )
         else:
-            new_position = wrap(self.p2_loc + move, 10)
+            new_position = wrap(self.p2_loc + move, places)
             new_score = self.p2_score + new_position
             return BoardState(
                 self.p1_loc,
                 new_position,
                 self.p1_score,
-                new_score,
-                self.count * count
+                new_score
             )
 
 
 def _main() -> str:
     my_input = load_lines()
     board = Board.parse_input(my_input)
-    while not board.games_over():
-        for player in board.games_won.keys():
-            board.player_turn(player)
-            print(len(board.states))
-            if board.games_over():
-                break
+    board.play()
     result = max(board.games_won.values())
     return str(result)
 
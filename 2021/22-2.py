@@ -1,9 +1,11 @@
 import dataclasses
 import datetime
 from functools import lru_cache
-from typing import Optional, List, Set, Union
+from typing import Optional, List, Set, Union, Tuple
 
-from utils.coords3d import Coords3D, Map3D
+import numpy
+
+from utils.coords3d import Coords3D
 from utils.input import load_lines
 
 
@@ -190,24 +192,38 @@ class Instruction:
 
 
 class Reactor:
+    """
+    Replays instructions over the compressed grid one slab of x values at a time, to bound memory.
+    """
 
-    def __init__(self, lookup: "LookupTables"):
+    def __init__(self, lookup: "LookupTables", slab_size: int = 8):
         self.lookup = lookup
-        self.map = Map3D(len(lookup.x_lookup), len(lookup.y_lookup), len(lookup.z_lookup), False)
-        # self.cuboids = set()
+        self.slab_size = slab_size
+        self.instructions: List[Tuple[Cuboid, bool]] = []
 
     def apply_instruction(self, instruction: Instruction) -> None:
-        mapped = self.lookup.lookup(instruction.cuboid)
-        for x in range(mapped.start.x, mapped.end.x):
-            for y in range(mapped.start.y, mapped.end.y):
-                for z in range(mapped.start.z, mapped.end.z):
-                    self.map.set_value(Coords3D(x, y, z), instruction.state)
+        self.instructions.append((self.lookup.lookup(instruction.cuboid), instruction.state))
 
     def count_on(self) -> int:
-        return sum(
-            self.lookup.coords_size(coord)
-            for coord in self.map.all_coords_with_value(True)
-        )
+        x_sizes = numpy.array([self.lookup.x_sizes[i] for i in range(len(self.lookup.x_sizes))], dtype=numpy.int64)
+        y_sizes = numpy.array([self.lookup.y_sizes[i] for i in range(len(self.lookup.y_sizes))], dtype=numpy.int64)
+        z_sizes = numpy.array([self.lookup.z_sizes[i] for i in range(len(self.lookup.z_sizes))], dtype=numpy.int64)
+        total = 0
+        for slab_start in range(0, len(x_sizes), self.slab_size):
+            slab_end = min(slab_start + self.slab_size, len(x_sizes))
+            slab = numpy.zeros((slab_end - slab_start, len(y_sizes), len(z_sizes)), dtype=bool)
+            for mapped, state in self.instructions:
+                start_x = max(mapped.start.x, slab_start)
+                end_x = min(mapped.end.x, slab_end)
+                if start_x >= end_x:
+                    continue
+                slab[
+                    start_x - slab_start:end_x - slab_start,
+                    mapped.start.y:mapped.end.y,
+                    mapped.start.z:mapped.end.z
+                ] = state
+            total += int(x_sizes[slab_start:slab_end] @ (slab @ z_sizes) @ y_sizes)
+        return total
 
 
 def _test() -> None:
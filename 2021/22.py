@@ -1,6 +1,7 @@
 import datetime
 
-from utils.coords3d import Map3D, Coords3D
+from utils.array_map3d import ArrayMap3D
+from utils.coords3d import Coords3D
 from utils.input import load_lines
 
 
@@ -30,7 +31,7 @@ class Cuboid:
 class Reactor:
 
     def __init__(self):
-        self.map = Map3D(101, 101, 101, False)
+        self.map = ArrayMap3D(101, 101, 101, False)
         self.offset = -50
 
     def apply_cuboid(self, cuboid: Cuboid) -> None:
@@ -40,10 +41,7 @@ class Reactor:
             print(f"Skipping cuboid: {cuboid}")
             return
         print(f"Applying cuboid: {cuboid}")
-        for x in range(start.x, end.x + 1):
-            for y in range(start.y, end.y + 1):
-                for z in range(start.z, end.z + 1):
-                    self.map.set_value(Coords3D(x, y, z), cuboid.state)
+        self.map.fill_region(start, end, cuboid.state)
 
     def count_on(self) -> int:
         return self.map.count(True)
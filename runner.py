@@ -1,9 +1,25 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from glob import glob
 from enum import Enum
-from typing import Optional
+from typing import Optional, List, Tuple, Iterator, Dict, Union
+import argparse
+import contextlib
+import csv
+import dataclasses
 import datetime
 import importlib
+import io
+import json
+import math
+import os
+import runpy
+import statistics
+import sys
+import time
+import tracemalloc
 
+from utils.input import day_context, clear_input_cache
 from utils.types import is_int
 
 scripts = ["create_new_day", "view_leaderboard_times"]
@@ -15,6 +31,46 @@ class CoreChoice(Enum):
     SCRIPT = "1"
 
 
+@dataclasses.dataclass
+class PartResult:
+    year: str
+    day: str
+    part: int
+    answer: Optional[str]
+    wall_time: float
+    cpu_time: float
+    peak_memory: int
+    error: Optional[str] = None
+
+
+@dataclasses.dataclass
+class BenchResult:
+    year: str
+    day: str
+    part: int
+    repeats: int
+    min_time: Optional[float]
+    median_time: Optional[float]
+    p95_time: Optional[float]
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.year}/{self.day}/{self.part}"
+
+
+def list_days(year: str) -> List[str]:
+    return sorted([d[7:-3] for d in glob(f"./{year}/[0-9][0-9].py")])
+
+
+def list_parts(year: str, day: str) -> List[Tuple[int, str]]:
+    parts = [(1, f"./{year}/{day}.py")]
+    part_2_file = f"./{year}/{day}-2.py"
+    if os.path.exists(part_2_file):
+        parts.append((2, part_2_file))
+    return parts
+
+
 def choose_daily_or_script() -> Optional[CoreChoice]:
     resp = input("Would you like to run a daily solution [0] or a script [1]: ")
     if resp not in ["0", "1"]:
@@ -28,7 +84,7 @@ def choose_date() -> Optional[datetime.date]:
     if year not in years:
         print("Year not recognised")
         return None
-    days = sorted([d[7:-3] for d in glob(f"./{year}/[0-9][0-9].py")])
+    days = list_days(year)
     day = input(f"Which day would you like to run: ({', '.join(days)}) ")
     if day not in days:
         print("Day not recognised")
@@ -52,17 +108,255 @@ def run_script(script: str) -> None:
 
 
 def run_advent_date(date: datetime.date) -> None:
-    i1 = importlib.import_module(f"{date.year}.{date.day}")
+    i1 = importlib.import_module(f"{date.year}.{date.day:02}")
     start_time = datetime.datetime.now()
-    print(i1._main())
+    with day_context(i1.__file__):
+        print(i1._main())
     print(f"Part one took: {(datetime.datetime.now()-start_time).total_seconds()}s")
-    i2 = importlib.import_module(f"{date.year}.{date.day}-2")
+    i2 = importlib.import_module(f"{date.year}.{date.day:02}-2")
     start_time = datetime.datetime.now()
-    print(i2._main())
+    with day_context(i2.__file__):
+        print(i2._main())
     print(f"Part two took: {(datetime.datetime.now()-start_time).total_seconds()}s")
 
 
-if __name__ == "__main__":
+@contextlib.contextmanager
+def working_directory(path: str) -> Iterator[None]:
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def final_answer(output: str) -> Optional[str]:
+    lines = [
+        line for line in output.strip().split("\n")
+        if line and not line.startswith("Time taken:")
+    ]
+    if not lines:
+        return None
+    return lines[-1]
+
+
+def execute_part(part_file: str) -> Tuple[str, Optional[str]]:
+    """
+    Runs a single solution file as __main__, returning its output and any error, so that days with and without a
+    _main() are handled the same way.
+    """
+    output = io.StringIO()
+    error = None
+    try:
+        with working_directory(os.path.dirname(part_file)), day_context(part_file), redirect_stdout(output):
+            runpy.run_path(part_file, run_name="__main__")
+    except SystemExit as e:
+        if e.code not in [None, 0]:
+            error = f"SystemExit: {e.code}"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return output.getvalue(), error
+
+
+def run_part(year: str, day: str, part: int, part_file: str, trace_memory: bool = True) -> PartResult:
+    """
+    Times a solution file, taking the final line of output (ignoring the solution's own timing line) as the answer.
+    Tracing memory slows a solution down many times over, so peak memory comes from a second, untimed run.
+    """
+    part_file = os.path.abspath(part_file)
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    output, error = execute_part(part_file)
+    wall_time = time.perf_counter() - start_wall
+    cpu_time = time.process_time() - start_cpu
+    peak_memory = 0
+    if trace_memory and error is None:
+        # Start the traced run cold, so that reading and parsing the input counts towards peak memory
+        clear_input_cache()
+        tracemalloc.start()
+        execute_part(part_file)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return PartResult(
+        year,
+        day,
+        part,
+        final_answer(output) if error is None else None,
+        wall_time,
+        cpu_time,
+        peak_memory,
+        error
+    )
+
+
+def report_progress(result: PartResult) -> None:
+    error_msg = "" if result.error is None else f" ({result.error})"
+    print(f"{result.year} day {result.day} part {result.part}: {result.wall_time:.3f}s{error_msg}", file=sys.stderr)
+
+
+def list_tasks(batch_years: List[str], batch_days: Optional[List[str]] = None) -> List[Tuple[str, str, int, str]]:
+    return [
+        (year, day, part, part_file)
+        for year in batch_years
+        for day in list_days(year)
+        if batch_days is None or day in batch_days
+        for part, part_file in list_parts(year, day)
+    ]
+
+
+def run_batch(batch_years: List[str], batch_days: Optional[List[str]] = None, jobs: int = 1) -> List[PartResult]:
+    tasks = list_tasks(batch_years, batch_days)
+    if jobs == 1:
+        results = []
+        for task in tasks:
+            result = run_part(*task)
+            report_progress(result)
+            results.append(result)
+        return results
+    # Each worker process runs one part at a time, so working directory, stdout capture and tracemalloc stay per-part
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_part, *task) for task in tasks]
+        results = []
+        for future in futures:
+            result = future.result()
+            report_progress(result)
+            results.append(result)
+        return results
+
+
+def percentile(times: List[float], pct: float) -> float:
+    ordered = sorted(times)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def bench_part(year: str, day: str, part: int, part_file: str, warmup: int, repeats: int) -> BenchResult:
+    for _ in range(warmup):
+        result = run_part(year, day, part, part_file, trace_memory=False)
+        if result.error is not None:
+            return BenchResult(year, day, part, 0, None, None, None, result.error)
+    times = []
+    for _ in range(repeats):
+        result = run_part(year, day, part, part_file, trace_memory=False)
+        if result.error is not None:
+            return BenchResult(year, day, part, len(times), None, None, None, result.error)
+        times.append(result.wall_time)
+    return BenchResult(year, day, part, repeats, min(times), statistics.median(times), percentile(times, 95))
+
+
+def run_bench(
+        bench_years: List[str],
+        bench_days: Optional[List[str]],
+        warmup: int,
+        repeats: int
+) -> List[BenchResult]:
+    results = []
+    for task in list_tasks(bench_years, bench_days):
+        result = bench_part(*task, warmup, repeats)
+        if result.error is not None:
+            print(f"{result.year} day {result.day} part {result.part}: {result.error}", file=sys.stderr)
+        else:
+            print(
+                f"{result.year} day {result.day} part {result.part}: min {result.min_time:.3f}s, "
+                f"median {result.median_time:.3f}s, p95 {result.p95_time:.3f}s",
+                file=sys.stderr
+            )
+        results.append(result)
+    return results
+
+
+def load_baseline(baseline_file: str) -> Dict[str, Dict[str, float]]:
+    if not os.path.exists(baseline_file):
+        return {}
+    with open(baseline_file, "r") as f:
+        return json.load(f)
+
+
+def save_baseline(baseline_file: str, baseline: Dict[str, Dict[str, float]], results: List[BenchResult]) -> None:
+    for result in results:
+        if result.error is not None:
+            continue
+        baseline[result.key] = {
+            "min_time": result.min_time,
+            "median_time": result.median_time,
+            "p95_time": result.p95_time
+        }
+    with open(baseline_file, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def find_regressions(
+        results: List[BenchResult],
+        baseline: Dict[str, Dict[str, float]],
+        threshold: float
+) -> List[str]:
+    """
+    Compares median times against the baseline, returning a description of each part which has slowed down by more
+    than the threshold fraction, or which now fails to run.
+    """
+    regressions = []
+    for result in results:
+        if result.key not in baseline:
+            continue
+        if result.error is not None:
+            regressions.append(f"{result.key} failed: {result.error}")
+            continue
+        baseline_time = baseline[result.key]["median_time"]
+        if result.median_time > baseline_time * (1 + threshold):
+            regressions.append(
+                f"{result.key} median {result.median_time:.3f}s is more than {threshold:.0%} slower than "
+                f"baseline {baseline_time:.3f}s"
+            )
+    return regressions
+
+
+def write_results(
+        results: Union[List[PartResult], List[BenchResult]],
+        output_format: str,
+        output_file: Optional[str]
+) -> None:
+    rows = [dataclasses.asdict(result) for result in results]
+    with (open(output_file, "w", newline="") if output_file else contextlib.nullcontext(sys.stdout)) as f:
+        if output_format == "csv":
+            result_type = type(results[0]) if results else PartResult
+            writer = csv.DictWriter(f, fieldnames=[field.name for field in dataclasses.fields(result_type)])
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, f, indent=2)
+            f.write("\n")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run advent of code solutions")
+    subparsers = parser.add_subparsers(dest="command")
+    selection_parser = argparse.ArgumentParser(add_help=False)
+    selection_parser.add_argument("--years", nargs="+", choices=years, default=years)
+    selection_parser.add_argument("--days", nargs="+", help="Only run these days, e.g. 01 15")
+    selection_parser.add_argument("--format", choices=["json", "csv"], default="json")
+    selection_parser.add_argument("--output", help="File to write the report to, defaults to stdout")
+    batch_parser = subparsers.add_parser(
+        "batch", parents=[selection_parser], help="Run every day's solutions and report timings"
+    )
+    batch_parser.add_argument(
+        "--jobs", "-j", type=int, default=1, help="Number of solutions to run in parallel, 0 to use every core"
+    )
+    bench_parser = subparsers.add_parser(
+        "bench", parents=[selection_parser], help="Benchmark solutions repeatedly and compare against a baseline"
+    )
+    bench_parser.add_argument("--warmup", type=int, default=1, help="Untimed runs before measuring")
+    bench_parser.add_argument("--repeats", type=int, default=5, help="Timed runs per part")
+    bench_parser.add_argument("--baseline", default="bench_baseline.json", help="Baseline timings file")
+    bench_parser.add_argument(
+        "--update-baseline", action="store_true", help="Record these timings as the new baseline"
+    )
+    bench_parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Fractional slowdown of the median that counts as a regression"
+    )
+    return parser.parse_args()
+
+
+def interactive() -> None:
     core_choice = None
     while core_choice is None:
         core_choice = choose_daily_or_script()
@@ -80,3 +374,24 @@ if __name__ == "__main__":
         run_script(script_choice)
     else:
         print("Unrecognised option.")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "batch":
+        write_results(run_batch(args.years, args.days, args.jobs or os.cpu_count()), args.format, args.output)
+    elif args.command == "bench":
+        bench_results = run_bench(args.years, args.days, args.warmup, args.repeats)
+        write_results(bench_results, args.format, args.output)
+        bench_baseline = load_baseline(args.baseline)
+        if args.update_baseline:
+            save_baseline(args.baseline, bench_baseline, bench_results)
+        else:
+            found_regressions = find_regressions(bench_results, bench_baseline, args.threshold)
+            if found_regressions:
+                print("PERFORMANCE REGRESSIONS:", file=sys.stderr)
+                for regression in found_regressions:
+                    print(f"  {regression}", file=sys.stderr)
+                sys.exit(1)
+    else:
+        interactive()
@@ -0,0 +1,303 @@
+from typing import List, Iterable, Callable
+
+import numpy
+
+from utils.coords2d import Coords2D, Line2D, Map2D, T
+
+
+def dtype_for_fill(fill: T) -> numpy.dtype:
+    if isinstance(fill, bool):
+        return numpy.dtype(bool)
+    if isinstance(fill, int):
+        return numpy.dtype(numpy.int64)
+    if isinstance(fill, float):
+        return numpy.dtype(numpy.float64)
+    return numpy.dtype(object)
+
+
+def python_value(value: T) -> T:
+    # Object arrays already hold python values, other arrays give numpy scalars
+    return value.item() if isinstance(value, numpy.generic) else value
+
+
+class ArrayMap2D(Map2D[T]):
+    """
+    A Map2D stored as a dense numpy array, indexed [y, x], so that whole-grid and region operations can run as array
+    operations rather than per-cell python loops.
+    """
+
+    def __init__(self, width: int, height: int, fill: T = None) -> None:
+        super().__init__(0, 0)
+        self.map = numpy.full((height, width), fill, dtype=dtype_for_fill(fill))
+
+    @classmethod
+    def from_array(cls, array: numpy.ndarray) -> "ArrayMap2D":
+        grid = cls(0, 0)
+        grid.map = array
+        return grid
+
+    @classmethod
+    def from_map(cls, grid: Map2D[T]) -> "ArrayMap2D[T]":
+        return cls.from_array(numpy.array(grid.map))
+
+    @property
+    def width(self) -> int:
+        return self.map.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.map.shape[0]
+
+    def get_value(self, coords: Coords2D) -> T:
+        return python_value(self.map[coords.y, coords.x])
+
+    def set_value(self, coords: Coords2D, val: T) -> None:
+        self.map[coords.y, coords.x] = val
+
+    def set_value_if_smaller(self, coords: Coords2D, val: T) -> None:
+        if self.map[coords.y, coords.x] > val:
+            self.set_value(coords, val)
+
+    def all_coords(self) -> Iterable[Coords2D]:
+        for y in range(self.height):
+            for x in range(self.width):
+                yield Coords2D(x, y)
+
+    def all_coords_with_value(self, value: T) -> Iterable[Coords2D]:
+        for y, x in zip(*numpy.nonzero(self.map == value)):
+            yield Coords2D(int(x), int(y))
+
+    @classmethod
+    def from_number_input(cls, input_list: List[str]) -> "ArrayMap2D[int]":
+        digits = numpy.frombuffer("".join(input_list).encode(), dtype=numpy.uint8) - ord("0")
+        return cls.from_array(digits.reshape(len(input_list), -1).astype(numpy.int64))
+
+    @classmethod
+    def from_bool_input(cls, input_list: List[str], true_value: str = "1") -> "ArrayMap2D[bool]":
+        chars = numpy.frombuffer("".join(input_list).encode(), dtype=numpy.uint8)
+        return cls.from_array((chars == ord(true_value)).reshape(len(input_list), -1))
+
+    def count(self, value: T) -> int:
+        return int(numpy.count_nonzero(self.map == value))
+
+    def copy(self) -> "ArrayMap2D[T]":
+        return self.from_array(self.map.copy())
+
+    def _region(self, start: Coords2D, end: Coords2D) -> tuple:
+        # Regions are inclusive of both corners, matching Line2D
+        return (
+            slice(min(start.y, end.y), max(start.y, end.y) + 1),
+            slice(min(start.x, end.x), max(start.x, end.x) + 1)
+        )
+
+    def fill(self, val: T) -> None:
+        self.map.fill(val)
+
+    def fill_region(self, start: Coords2D, end: Coords2D, val: T) -> None:
+        self.map[self._region(start, end)] = val
+
+    def add_region(self, start: Coords2D, end: Coords2D, val: T) -> None:
+        self.map[self._region(start, end)] += val
+
+    def apply_region(self, start: Coords2D, end: Coords2D, func: Callable[[numpy.ndarray], numpy.ndarray]) -> None:
+        """
+        Replaces every value in the region with the result of func, which is called once with the whole region as an
+        array, so it should be written with array operations, e.g. numpy.maximum rather than max.
+        """
+        region = self._region(start, end)
+        self.map[region] = func(self.map[region])
+
+    def add(self, val: T) -> None:
+        self.map += val
+
+    def add_line(self, line: Line2D, val: T = 1) -> None:
+        if line.vertical or line.horizontal:
+            self.add_region(line.start, line.end, val)
+            return
+        if not line.diagonal:
+            raise NotImplementedError
+        xs = numpy.arange(line.min_x, line.max_x + 1)
+        ys = numpy.arange(line.min_y, line.max_y + 1)
+        if not line.leading_diagonal:
+            ys = ys[::-1]
+        self.map[ys, xs] += val
+
+    def threshold(self, min_value: T) -> "ArrayMap2D[bool]":
+        return ArrayMap2D.from_array(self.map >= min_value)
+
+    def shifted_views(self, offsets: List[Coords2D], fill: T) -> List[numpy.ndarray]:
+        """
+        Returns, for each offset, an array the same shape as this map where each cell holds the value of the cell at
+        that offset from it. Cells which would fall outside the map take the fill value.
+        """
+        padding = max([max(abs(offset.x), abs(offset.y)) for offset in offsets] + [0])
+        padded = numpy.pad(self.map, padding, constant_values=fill)
+        return [
+            padded[
+                padding + offset.y:padding + offset.y + self.height,
+                padding + offset.x:padding + offset.x + self.width
+            ]
+            for offset in offsets
+        ]
+
+    def neighbour_sum(self, with_diagonals: bool = False, fill: T = 0) -> "ArrayMap2D[int]":
+        total = numpy.zeros((self.height, self.width), dtype=numpy.int64)
+        for view in self.shifted_views(Coords2D(0, 0).list_neighbours(with_diagonals), fill):
+            total += view
+        return ArrayMap2D.from_array(total)
+
+    def neighbour_min(self, with_diagonals: bool = False, fill: T = None) -> "ArrayMap2D[T]":
+        if fill is None:
+            fill = numpy.iinfo(self.map.dtype).max if self.map.dtype.kind in "iu" else numpy.inf
+        views = self.shifted_views(Coords2D(0, 0).list_neighbours(with_diagonals), fill)
+        return ArrayMap2D.from_array(numpy.minimum.reduce(views))
+
+    def neighbourhood_index(self, fill: bool = False) -> "ArrayMap2D[int]":
+        """
+        Reads the 3x3 neighbourhood of each cell, including itself, as a 9-bit binary number, most significant bit at
+        the top left and reading along each row in turn. Cells outside the map are read as the fill value.
+        """
+        offsets = [Coords2D(x, y) for y in range(-1, 2) for x in range(-1, 2)]
+        index = numpy.zeros((self.height, self.width), dtype=numpy.int64)
+        for view in self.shifted_views(offsets, fill):
+            index = (index << 1) | (view != 0)
+        return ArrayMap2D.from_array(index)
+
+
+class InfiniteMap2D(Map2D[T]):
+    """
+    An unbounded, double-buffered map in world coordinates, where cells outside the bounds hold the background value.
+    """
+
+    def __init__(self, width: int, height: int, fill: T = None, background: T = None) -> None:
+        self.background = fill if background is None else background
+        self.min_x = 0
+        self.min_y = 0
+        self._width = width
+        self._height = height
+        margin = max(width, height, 4)
+        self._buffer_x = -margin
+        self._buffer_y = -margin
+        self._buffer = numpy.full(
+            (height + 2 * margin, width + 2 * margin), self.background, dtype=dtype_for_fill(self.background)
+        )
+        self._buffer[margin:margin + height, margin:margin + width] = fill
+        self._spare = numpy.empty_like(self._buffer)
+
+    @classmethod
+    def from_bool_input(cls, input_list: List[str], true_value: str = "1") -> "InfiniteMap2D[bool]":
+        grid = cls(len(input_list[0]), len(input_list), False)
+        grid.map[:] = ArrayMap2D.from_bool_input(input_list, true_value).map
+        return grid
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def map(self) -> numpy.ndarray:
+        top = self.min_y - self._buffer_y
+        left = self.min_x - self._buffer_x
+        return self._buffer[top:top + self._height, left:left + self._width]
+
+    def valid_coords(self, coords: Coords2D) -> bool:
+        return (
+            self.min_x <= coords.x < self.min_x + self._width
+            and self.min_y <= coords.y < self.min_y + self._height
+        )
+
+    def get_value(self, coords: Coords2D) -> T:
+        if not self.valid_coords(coords):
+            return self.background
+        return python_value(self._buffer[coords.y - self._buffer_y, coords.x - self._buffer_x])
+
+    def set_value(self, coords: Coords2D, val: T) -> None:
+        if not self.valid_coords(coords):
+            self._set_bounds(
+                min(self.min_x, coords.x),
+                min(self.min_y, coords.y),
+                max(self.min_x + self._width - 1, coords.x),
+                max(self.min_y + self._height - 1, coords.y)
+            )
+        self._buffer[coords.y - self._buffer_y, coords.x - self._buffer_x] = val
+
+    def set_value_if_smaller(self, coords: Coords2D, val: T) -> None:
+        if self.get_value(coords) > val:
+            self.set_value(coords, val)
+
+    def all_coords(self) -> Iterable[Coords2D]:
+        for y in range(self.min_y, self.min_y + self._height):
+            for x in range(self.min_x, self.min_x + self._width):
+                yield Coords2D(x, y)
+
+    def count(self, value: T) -> int:
+        """
+        Counts matching cells within the bounds. There are infinitely many background cells outside them.
+        """
+        return int(numpy.count_nonzero(self.map == value))
+
+    def _set_bounds(self, min_x: int, min_y: int, max_x: int, max_y: int) -> None:
+        # Bounds are inclusive, and always keep at least one spare background cell around them in the buffer
+        buffer_height, buffer_width = self._buffer.shape
+        if not (
+            min_x - 1 >= self._buffer_x
+            and min_y - 1 >= self._buffer_y
+            and max_x + 1 < self._buffer_x + buffer_width
+            and max_y + 1 < self._buffer_y + buffer_height
+        ):
+            width = max_x - min_x + 1
+            height = max_y - min_y + 1
+            margin = max(width, height, 4)
+            old_map = self.map
+            old_top = self.min_y - (min_y - margin)
+            old_left = self.min_x - (min_x - margin)
+            self._buffer = numpy.full((height + 2 * margin, width + 2 * margin), self.background, self._buffer.dtype)
+            self._buffer[old_top:old_top + self._height, old_left:old_left + self._width] = old_map
+            self._spare = numpy.empty_like(self._buffer)
+            self._buffer_x = min_x - margin
+            self._buffer_y = min_y - margin
+        self.min_x = min_x
+        self.min_y = min_y
+        self._width = max_x - min_x + 1
+        self._height = max_y - min_y + 1
+
+    def step_lookup(self, lookup: numpy.ndarray) -> None:
+        """
+        Advances a boolean cellular automaton a generation, indexing lookup as ArrayMap2D.neighbourhood_index() does.
+        """
+        self._set_bounds(self.min_x - 1, self.min_y - 1, self.min_x + self._width, self.min_y + self._height)
+        top = self.min_y - self._buffer_y
+        left = self.min_x - self._buffer_x
+        index = numpy.zeros((self._height, self._width), dtype=numpy.int64)
+        for y in range(-1, 2):
+            for x in range(-1, 2):
+                index <<= 1
+                index |= self._buffer[top + y:top + y + self._height, left + x:left + x + self._width]
+        self.background = lookup[511 if self.background else 0].item()
+        self._spare.fill(self.background)
+        self._spare[top:top + self._height, left:left + self._width] = lookup[index]
+        self._buffer, self._spare = self._spare, self._buffer
+
+
+def _test() -> None:
+    for fill in [None, ".", 0, False]:
+        grid = ArrayMap2D(3, 3, fill)
+        assert grid.get_value(Coords2D(0, 0)) == fill
+        assert type(grid.get_value(Coords2D(0, 0))) is type(fill)
+        assert grid.try_get_value(Coords2D(2, 2)) == fill
+    grid = ArrayMap2D(3, 3, ".")
+    grid.set_value(Coords2D(1, 2), "#")
+    assert grid.get_value(Coords2D(1, 2)) == "#"
+    infinite = InfiniteMap2D(2, 2, ".")
+    assert infinite.get_value(Coords2D(0, 0)) == "."
+    assert infinite.get_value(Coords2D(-5, 7)) == "."
+    infinite.set_value(Coords2D(-5, 7), "#")
+    assert infinite.get_value(Coords2D(-5, 7)) == "#"
+
+
+if __name__ == "__main__":
+    _test()
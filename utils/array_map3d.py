@@ -0,0 +1,96 @@
+from typing import Iterable, Tuple
+
+import numpy
+
+from utils.array_map2d import dtype_for_fill, python_value
+from utils.coords2d import T
+from utils.coords3d import Coords3D, Map3D
+
+
+class ArrayMap3D(Map3D):
+    """
+    A Map3D stored as a dense numpy array, indexed [y, x, z] like the nested lists of Map3D.
+    """
+
+    def __init__(self, width: int, height: int, depth: int, fill: T = None) -> None:
+        self.map = numpy.full((height, width, depth), fill, dtype=dtype_for_fill(fill))
+
+    @classmethod
+    def from_array(cls, array: numpy.ndarray) -> "ArrayMap3D":
+        grid = cls(0, 0, 0)
+        grid.map = array
+        return grid
+
+    @property
+    def height(self) -> int:
+        return self.map.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.map.shape[1]
+
+    @property
+    def depth(self) -> int:
+        return self.map.shape[2]
+
+    def get_value(self, coords: Coords3D) -> T:
+        return python_value(self.map[coords.y, coords.x, coords.z])
+
+    def set_value(self, coords: Coords3D, val: T) -> None:
+        self.map[coords.y, coords.x, coords.z] = val
+
+    def set_value_if_smaller(self, coords: Coords3D, val: T) -> None:
+        if self.map[coords.y, coords.x, coords.z] > val:
+            self.set_value(coords, val)
+
+    def matching_indexes(self, value: T) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        Returns the x, y and z indexes of every cell holding the value, as three arrays of equal length.
+        """
+        ys, xs, zs = numpy.nonzero(self.map == value)
+        return xs, ys, zs
+
+    def all_coords_with_value(self, value: T) -> Iterable[Coords3D]:
+        for x, y, z in zip(*self.matching_indexes(value)):
+            yield Coords3D(int(x), int(y), int(z))
+
+    def count(self, value: T) -> int:
+        return int(numpy.count_nonzero(self.map == value))
+
+    def copy(self) -> "ArrayMap3D":
+        return self.from_array(self.map.copy())
+
+    def _region(self, start: Coords3D, end: Coords3D) -> tuple:
+        # Regions are inclusive of both corners, as in ArrayMap2D
+        return (
+            slice(min(start.y, end.y), max(start.y, end.y) + 1),
+            slice(min(start.x, end.x), max(start.x, end.x) + 1),
+            slice(min(start.z, end.z), max(start.z, end.z) + 1)
+        )
+
+    def fill(self, val: T) -> None:
+        self.map.fill(val)
+
+    def fill_region(self, start: Coords3D, end: Coords3D, val: T) -> None:
+        self.map[self._region(start, end)] = val
+
+    def add_region(self, start: Coords3D, end: Coords3D, val: T) -> None:
+        self.map[self._region(start, end)] += val
+
+    def count_region(self, start: Coords3D, end: Coords3D, value: T) -> int:
+        return int(numpy.count_nonzero(self.map[self._region(start, end)] == value))
+
+
+def _test() -> None:
+    for fill in [None, ".", 0, False]:
+        grid = ArrayMap3D(2, 2, 2, fill)
+        assert grid.get_value(Coords3D(1, 1, 1)) == fill
+        assert type(grid.get_value(Coords3D(1, 1, 1))) is type(fill)
+    grid = ArrayMap3D(2, 2, 2, ".")
+    grid.fill_region(Coords3D(0, 0, 0), Coords3D(1, 0, 1), "#")
+    assert grid.get_value(Coords3D(1, 0, 1)) == "#"
+    assert grid.count("#") == 4
+
+
+if __name__ == "__main__":
+    _test()
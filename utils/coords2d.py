@@ -1,12 +1,37 @@
 import dataclasses
+from array import array
 from functools import cached_property
-from typing import Union, Iterable, TypeVar, Generic, List, Optional
+from operator import itemgetter
+from typing import Union, Iterable, TypeVar, Generic, List, Optional, Tuple
 
+from utils.math import wrap
 
-@dataclasses.dataclass(order=True, eq=True, frozen=True)
-class Coords2D:
-    x: int
-    y: int
+
+# Offsets of the orthogonal neighbours, then the diagonal neighbours, in the order list_neighbours returns them
+NEIGHBOUR_OFFSETS = ((-1, 0), (0, -1), (1, 0), (0, 1))
+DIAGONAL_OFFSETS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+# Creates coordinates without going through Coords2D.__new__, for the hottest paths
+_new_tuple = tuple.__new__
+
+
+class Coords2D(tuple):
+    """
+    Immutable 2D coordinates. This is a tuple subclass rather than a frozen dataclass, as coordinates are created,
+    hashed and compared in the innermost loops of most grid solutions, and tuples do all of that in C.
+    """
+    __slots__ = ()
+
+    def __new__(cls, x: int, y: int) -> "Coords2D":
+        return tuple.__new__(cls, (x, y))
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+    x = property(itemgetter(0))
+    y = property(itemgetter(1))
+
+    def __repr__(self) -> str:
+        return f"Coords2D(x={self.x!r}, y={self.y!r})"
 
     @classmethod
     def from_input_line(cls, input_line: str, sep: str = ",") -> "Coords2D":
@@ -24,35 +49,23 @@ class Coords2D:
         return Coords2D(x, y)
 
     def __sub__(self, other: "Coords2D") -> "Coords2D":
-        return Coords2D(
-            self.x - other.x,
-            self.y - other.y
-        )
+        return _new_tuple(Coords2D, (
+            self[0] - other[0],
+            self[1] - other[1]
+        ))
 
     def __add__(self, other: "Coords2D") -> "Coords2D":
-        return Coords2D(
-            self.x + other.x,
-            self.y + other.y
-        )
-
-    def __hash__(self):
-        return hash((self.x, self.y))
+        return _new_tuple(Coords2D, (
+            self[0] + other[0],
+            self[1] + other[1]
+        ))
 
     def list_neighbours(self, with_diagonals: bool = False) -> List["Coords2D"]:
-        neighbours = [
-            Coords2D(self.x - 1, self.y),
-            Coords2D(self.x, self.y - 1),
-            Coords2D(self.x + 1, self.y),
-            Coords2D(self.x, self.y + 1)
-        ]
+        x, y = self
+        neighbours = [_new_tuple(Coords2D, (x + dx, y + dy)) for dx, dy in NEIGHBOUR_OFFSETS]
         if not with_diagonals:
             return neighbours
-        neighbours.extend([
-            Coords2D(self.x - 1, self.y - 1),
-            Coords2D(self.x - 1, self.y + 1),
-            Coords2D(self.x + 1, self.y - 1),
-            Coords2D(self.x + 1, self.y + 1)
-        ])
+        neighbours.extend([_new_tuple(Coords2D, (x + dx, y + dy)) for dx, dy in DIAGONAL_OFFSETS])
         return neighbours
 
 
@@ -183,3 +196,309 @@ class Map2D(Generic[T]):
             line.count(value)
             for line in self.map
         )
+
+
+def storage_for_fill(fill: T, size: int) -> Union[List[T], array, bytearray]:
+    if isinstance(fill, bool):
+        return bytearray([fill]) * size
+    if isinstance(fill, int):
+        return array("q", [fill]) * size
+    if isinstance(fill, float):
+        return array("d", [fill]) * size
+    return [fill] * size
+
+
+class FlatMap2D(Map2D[T]):
+    """
+    A Map2D stored as a single flat sequence, where a cell is addressed by the index y * width + x. Alongside the
+    usual coordinate methods, cells and their neighbours can be read by index, so that graph algorithms over a grid can
+    work entirely on ints without creating coordinate objects.
+    """
+
+    def __init__(self, width: int, height: int, fill: T = None) -> None:
+        self._width = width
+        self._height = height
+        self.is_bool = isinstance(fill, bool)
+        self.cells = storage_for_fill(fill, width * height)
+        self._neighbour_tables = {}
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def map(self) -> List[List[T]]:
+        return [self.row(y) for y in range(self.height)]
+
+    def row(self, y: int) -> List[T]:
+        row = self.cells[y * self.width:(y + 1) * self.width]
+        if self.is_bool:
+            return [bool(val) for val in row]
+        return list(row)
+
+    def index(self, coords: Coords2D) -> int:
+        return coords.y * self.width + coords.x
+
+    def coords_at(self, index: int) -> Coords2D:
+        y, x = divmod(index, self.width)
+        return Coords2D(x, y)
+
+    def get_value(self, coords: Coords2D) -> T:
+        return self.get_index_value(coords.y * self.width + coords.x)
+
+    def set_value(self, coords: Coords2D, val: T) -> None:
+        self.cells[coords.y * self.width + coords.x] = val
+
+    def set_value_if_smaller(self, coords: Coords2D, val: T) -> None:
+        index = coords.y * self.width + coords.x
+        if self.cells[index] > val:
+            self.cells[index] = val
+
+    def get_index_value(self, index: int) -> T:
+        if self.is_bool:
+            return bool(self.cells[index])
+        return self.cells[index]
+
+    def set_index_value(self, index: int, val: T) -> None:
+        self.cells[index] = val
+
+    def all_coords(self) -> Iterable[Coords2D]:
+        for y in range(self.height):
+            for x in range(self.width):
+                yield Coords2D(x, y)
+
+    def neighbour_table(self, with_diagonals: bool = False) -> List[Tuple[int, ...]]:
+        """
+        For each cell index, the indexes of its neighbours which are inside the map, in list_neighbours order.
+        This is built once per map, and reused by every later call.
+        """
+        if with_diagonals not in self._neighbour_tables:
+            offsets = NEIGHBOUR_OFFSETS + (DIAGONAL_OFFSETS if with_diagonals else ())
+            width = self.width
+            height = self.height
+            self._neighbour_tables[with_diagonals] = [
+                tuple(
+                    (y + dy) * width + x + dx
+                    for dx, dy in offsets
+                    if 0 <= x + dx < width and 0 <= y + dy < height
+                )
+                for y in range(height)
+                for x in range(width)
+            ]
+        return self._neighbour_tables[with_diagonals]
+
+    def valid_neighbours(self, coords: Coords2D, with_diagonals: bool = False) -> List[Coords2D]:
+        return [
+            self.coords_at(index) for index in self.neighbour_table(with_diagonals)[self.index(coords)]
+        ]
+
+    @classmethod
+    def from_number_input(cls, input_list: List[str]) -> "FlatMap2D[int]":
+        grid = cls(0, 0, fill=0)
+        grid._width = len(input_list[0]) if input_list else 0
+        grid._height = len(input_list)
+        grid.cells = array("q", [int(x) for line in input_list for x in line])
+        return grid
+
+    @classmethod
+    def from_bool_input(cls, input_list: List[str], true_value: str = "1") -> "FlatMap2D[bool]":
+        grid = cls(0, 0, fill=False)
+        grid._width = len(input_list[0]) if input_list else 0
+        grid._height = len(input_list)
+        grid.cells = bytearray(x == true_value for line in input_list for x in line)
+        return grid
+
+    @classmethod
+    def from_map(cls, grid: Map2D[T]) -> "FlatMap2D[T]":
+        flat = cls(grid.width, grid.height, fill=grid.get_value(Coords2D(0, 0)) if grid.size else None)
+        for y, row in enumerate(grid.map):
+            for x, val in enumerate(row):
+                flat.cells[y * flat.width + x] = val
+        return flat
+
+    def count(self, value: T) -> int:
+        return self.cells.count(value)
+
+
+class TiledMap2D(Map2D[int]):
+    """
+    A read-only view of a base map repeated tiles_x by tiles_y times, where each tile's values are increased by how
+    many tiles it is across and down from the top left, wrapping back around to 1 after max_value. Values are computed
+    when read, so the tiled map takes no more memory than the base map.
+    """
+
+    def __init__(self, base: Map2D[int], tiles_x: int, tiles_y: int, max_value: int = 9) -> None:
+        self.base = base if isinstance(base, FlatMap2D) else FlatMap2D.from_map(base)
+        self.tiles_x = tiles_x
+        self.tiles_y = tiles_y
+        self.max_value = max_value
+
+    @property
+    def width(self) -> int:
+        return self.base.width * self.tiles_x
+
+    @property
+    def height(self) -> int:
+        return self.base.height * self.tiles_y
+
+    @property
+    def map(self) -> List[List[int]]:
+        return [
+            [self.get_value(Coords2D(x, y)) for x in range(self.width)]
+            for y in range(self.height)
+        ]
+
+    def index(self, coords: Coords2D) -> int:
+        return coords.y * self.width + coords.x
+
+    def coords_at(self, index: int) -> Coords2D:
+        y, x = divmod(index, self.width)
+        return Coords2D(x, y)
+
+    def _value_at(self, x: int, y: int) -> int:
+        tile_x, base_x = divmod(x, self.base.width)
+        tile_y, base_y = divmod(y, self.base.height)
+        base_value = self.base.cells[base_y * self.base.width + base_x]
+        return wrap(base_value + tile_x + tile_y, self.max_value)
+
+    def get_value(self, coords: Coords2D) -> int:
+        return self._value_at(coords.x, coords.y)
+
+    def get_index_value(self, index: int) -> int:
+        y, x = divmod(index, self.width)
+        return self._value_at(x, y)
+
+    def set_value(self, coords: Coords2D, val: int) -> None:
+        raise TypeError("TiledMap2D is read-only")
+
+    def set_value_if_smaller(self, coords: Coords2D, val: int) -> None:
+        raise TypeError("TiledMap2D is read-only")
+
+    def all_coords(self) -> Iterable[Coords2D]:
+        for y in range(self.height):
+            for x in range(self.width):
+                yield Coords2D(x, y)
+
+    def count(self, value: int) -> int:
+        return sum(
+            row.count(value)
+            for row in self.map
+        )
+
+
+def reverse_bits(value: int, num_bits: int) -> int:
+    if num_bits <= 0:
+        return 0
+    return int(format(value, f"0{num_bits}b")[::-1], 2)
+
+
+class BitMap2D(Map2D[bool]):
+    """
+    A boolean Map2D packed into one python int per row, where bit x of row y holds cell (x, y). Counting, folding and
+    updating rectangles work on whole rows at a time, rather than cell by cell.
+    """
+
+    def __init__(self, width: int, height: int, fill: bool = False) -> None:
+        self._width = width
+        self.rows = [self._row_mask(0, width) if fill else 0 for _ in range(height)]
+
+    @staticmethod
+    def _row_mask(start_x: int, end_x: int) -> int:
+        # Mask for cells start_x up to, but not including, end_x
+        return ((1 << (end_x - start_x)) - 1) << start_x
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return len(self.rows)
+
+    @property
+    def map(self) -> List[List[bool]]:
+        return [
+            [bool((row >> x) & 1) for x in range(self.width)]
+            for row in self.rows
+        ]
+
+    def get_value(self, coords: Coords2D) -> bool:
+        return bool((self.rows[coords.y] >> coords.x) & 1)
+
+    def set_value(self, coords: Coords2D, val: bool) -> None:
+        if val:
+            self.rows[coords.y] |= 1 << coords.x
+        else:
+            self.rows[coords.y] &= ~(1 << coords.x)
+
+    def all_coords(self) -> Iterable[Coords2D]:
+        for y in range(self.height):
+            for x in range(self.width):
+                yield Coords2D(x, y)
+
+    @classmethod
+    def from_bool_input(cls, input_list: List[str], true_value: str = "1") -> "BitMap2D":
+        grid = cls(len(input_list[0]) if input_list else 0, 0)
+        grid.rows = [
+            sum(1 << x for x, char in enumerate(line) if char == true_value)
+            for line in input_list
+        ]
+        return grid
+
+    def count(self, value: bool) -> int:
+        count_true = sum(bin(row).count("1") for row in self.rows)
+        if value:
+            return count_true
+        return self.size - count_true
+
+    def _region_rows(self, start: Coords2D, end: Coords2D) -> Tuple[range, int]:
+        # Regions are inclusive of both corners
+        mask = self._row_mask(min(start.x, end.x), max(start.x, end.x) + 1)
+        return range(min(start.y, end.y), max(start.y, end.y) + 1), mask
+
+    def fill_region(self, start: Coords2D, end: Coords2D, val: bool) -> None:
+        row_range, mask = self._region_rows(start, end)
+        for y in row_range:
+            if val:
+                self.rows[y] |= mask
+            else:
+                self.rows[y] &= ~mask
+
+    def toggle_region(self, start: Coords2D, end: Coords2D) -> None:
+        row_range, mask = self._region_rows(start, end)
+        for y in row_range:
+            self.rows[y] ^= mask
+
+    def fold_up(self, y_value: int) -> None:
+        """
+        Folds the rows below y_value up over the rows above it, combining overlapping cells with OR. The fold row is
+        discarded, and the result is aligned on the fold, so it is as tall as the taller of the two halves.
+        """
+        new_height = max(y_value, self.height - 1 - y_value)
+        new_rows = []
+        for distance in range(new_height, 0, -1):
+            row = 0
+            if y_value - distance >= 0:
+                row |= self.rows[y_value - distance]
+            if y_value + distance < self.height:
+                row |= self.rows[y_value + distance]
+            new_rows.append(row)
+        self.rows = new_rows
+
+    def fold_left(self, x_value: int) -> None:
+        """
+        Folds the columns right of x_value over to the left of it, in the same way as fold_up().
+        """
+        right_width = self.width - 1 - x_value
+        new_width = max(x_value, right_width)
+        left_mask = self._row_mask(0, x_value)
+        self.rows = [
+            ((row & left_mask) << (new_width - x_value))
+            | (reverse_bits(row >> (x_value + 1), right_width) << (new_width - right_width))
+            for row in self.rows
+        ]
+        self._width = new_width
@@ -1,14 +1,19 @@
-import dataclasses
+from operator import itemgetter
 from typing import List, Optional, Iterable
 
 from utils.coords2d import Coords2D, Map2D, T
 
 
-@dataclasses.dataclass(order=True, eq=True, frozen=True)
 class Coords3D(Coords2D):
-    x: int
-    y: int
-    z: int
+    __slots__ = ()
+
+    def __new__(cls, x: int, y: int, z: int) -> "Coords3D":
+        return tuple.__new__(cls, (x, y, z))
+
+    z = property(itemgetter(2))
+
+    def __repr__(self) -> str:
+        return f"Coords3D(x={self.x!r}, y={self.y!r}, z={self.z!r})"
 
     @classmethod
     def from_input_line(cls, input_line: str, sep: str = ",") -> "Coords3D":
@@ -49,8 +54,8 @@ class Coords3D(Coords2D):
             -self.z
         )
 
-    def __hash__(self):
-        return hash((self.x, self.y, self.z))
+    def manhattan_distance(self, other: "Coords3D") -> int:
+        return abs(self.x - other.x) + abs(self.y - other.y) + abs(self.z - other.z)
 
     def list_neighbours(self, with_diagonals: bool = False) -> List["Coords3D"]:
         raise NotImplementedError
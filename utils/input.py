@@ -1,28 +1,139 @@
-import inspect
+import contextlib
 import os
-from typing import Optional, List
+import re
+import sys
+from typing import Optional, List, Dict, Tuple, Any, Callable, Iterator
+
+# Parsed forms of each input, keyed by (absolute path, form), alongside the file's (mtime, size) when it was parsed
+_input_cache: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+
+# Solution file which inputs are currently being loaded for, if set explicitly by a runner
+_day_file: Optional[str] = None
+
+
+def set_day_file(day_file: Optional[str]) -> None:
+    global _day_file
+    _day_file = None if day_file is None else os.path.abspath(day_file)
+
+
+@contextlib.contextmanager
+def day_context(day_file: str) -> Iterator[None]:
+    previous = _day_file
+    set_day_file(day_file)
+    try:
+        yield
+    finally:
+        set_day_file(previous)
+
+
+def _calling_day_file() -> str:
+    """
+    Finds the source file of the nearest caller outside this module, by walking back frame references rather than
+    building the full stack with inspect.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code.co_filename != __file__:
+            return os.path.abspath(frame.f_code.co_filename)
+        frame = frame.f_back
+    raise FileExistsError("Could not find input file")
 
 
 def find_input_filename(test: bool = False) -> Optional[str]:
     suffix = "-input.txt" if not test else "-test.txt"
-    my_filename = __name__.split(".")[-1]
-    for frame in inspect.stack():
-        filename, ext = os.path.basename(frame.filename).split(".", 1)
-        if filename != my_filename:
-            f_prefix = filename.split("-", 1)[0]
-            return f"{f_prefix}{suffix}"
-    raise FileExistsError("Could not find input file")
+    day_file = _day_file or _calling_day_file()
+    filename = os.path.basename(day_file).split(".", 1)[0]
+    day_match = re.match(r"[0-9]+", filename)
+    f_prefix = day_match.group(0) if day_match else filename.split("-", 1)[0]
+    return os.path.join(os.path.dirname(day_file), f"{f_prefix}{suffix}")
 
 
-def load_input(input_file: Optional[str] = None, test: bool = False) -> str:
-    input_file = input_file or find_input_filename(test)
+def clear_input_cache() -> None:
+    _input_cache.clear()
+
+
+def _read_file(input_file: str) -> str:
     with open(input_file, "r") as f:
         return f.read().strip()
 
 
+def _cached(input_file: str, form: str, parse: Callable[[], Any]) -> Any:
+    path = os.path.abspath(input_file)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    key = (path, form)
+    cached = _input_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    value = parse()
+    _input_cache[key] = (version, value)
+    return value
+
+
+def load_input(input_file: Optional[str] = None, test: bool = False) -> str:
+    input_file = input_file or find_input_filename(test)
+    return _cached(input_file, "str", lambda: _read_file(input_file))
+
+
 def load_lines(input_file: Optional[str] = None, test: bool = False) -> List[str]:
-    return load_input(input_file, test).split("\n")
+    input_file = input_file or find_input_filename(test)
+    lines = _cached(input_file, "lines", lambda: tuple(load_input(input_file).split("\n")))
+    return list(lines)
 
 
 def load_lines_split(sep: str, input_file: Optional[str] = None, test: bool = False) -> List[List[str]]:
-    return [line.split(sep) for line in load_lines(input_file, test)]
+    input_file = input_file or find_input_filename(test)
+    split_lines = _cached(
+        input_file,
+        f"split:{sep}",
+        lambda: tuple(tuple(line.split(sep)) for line in load_lines(input_file))
+    )
+    return [list(line) for line in split_lines]
+
+
+def iter_lines(input_file: Optional[str] = None, test: bool = False) -> Iterator[str]:
+    """
+    Streams the lines of the input file, matching load_lines() but without reading the whole file into memory.
+    """
+    input_file = input_file or find_input_filename(test)
+    with open(input_file, "r") as f:
+        # Each line is held back until the next non-blank one, as the last line has trailing whitespace stripped
+        previous = None
+        blank_lines = []
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip():
+                if previous is not None:
+                    blank_lines.append(line)
+                continue
+            if previous is None:
+                line = line.lstrip()
+            else:
+                yield previous
+                yield from blank_lines
+                blank_lines = []
+            previous = line
+        yield "" if previous is None else previous.rstrip()
+
+
+def iter_lines_split(sep: str, input_file: Optional[str] = None, test: bool = False) -> Iterator[List[str]]:
+    input_file = input_file or find_input_filename(test)
+    for line in iter_lines(input_file):
+        yield line.split(sep)
+
+
+def iter_blocks(input_file: Optional[str] = None, test: bool = False) -> Iterator[List[str]]:
+    """
+    Streams groups of lines which are separated by blank lines, one list of lines per group.
+    """
+    input_file = input_file or find_input_filename(test)
+    block = []
+    for line in iter_lines(input_file):
+        if not line.strip():
+            if block:
+                yield block
+            block = []
+        else:
+            block.append(line)
+    if block:
+        yield block
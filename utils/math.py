@@ -1,3 +1,7 @@
+import operator
+from typing import List
+
+
 def triangle_number(inp: int) -> int:
     return int((inp ** 2 / 2) + (inp / 2))
 
@@ -10,3 +14,37 @@ def wrap(num: int, mod: int) -> int:
     :return: The input number, wrapped by the mod number
     """
     return 1 + ((num - 1) % mod)
+
+
+def identity_matrix(size: int) -> List[List[int]]:
+    return [[int(row == column) for column in range(size)] for row in range(size)]
+
+
+def matrix_multiply(one: List[List[int]], two: List[List[int]]) -> List[List[int]]:
+    columns = list(zip(*two))
+    return [
+        [sum(map(operator.mul, row, column)) for column in columns]
+        for row in one
+    ]
+
+
+def matrix_vector_multiply(matrix: List[List[int]], vector: List[int]) -> List[int]:
+    return [sum(map(operator.mul, row, vector)) for row in matrix]
+
+
+def matrix_power(matrix: List[List[int]], power: int) -> List[List[int]]:
+    """
+    Raises a square matrix to a non-negative integer power by repeated squaring, so it takes O(log power) matrix
+    multiplications. Entries are python ints, so results are exact however large they grow.
+    :param matrix: Square matrix, as a list of rows
+    :param power: Power to raise it to
+    :return: The matrix multiplied by itself power times
+    """
+    result = identity_matrix(len(matrix))
+    while power:
+        if power & 1:
+            result = matrix_multiply(result, matrix)
+        power >>= 1
+        if power:
+            matrix = matrix_multiply(matrix, matrix)
+    return result
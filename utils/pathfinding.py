@@ -0,0 +1,237 @@
+import dataclasses
+import heapq
+import itertools
+from typing import Optional, List, Callable, Sequence, Iterable, Tuple, TypeVar, Hashable, Dict
+
+from utils.coords2d import Coords2D, Map2D, FlatMap2D
+
+S = TypeVar("S", bound=Hashable)
+
+
+@dataclasses.dataclass
+class PathResult:
+    # Lowest total cost to reach each cell, or None where the search never settled that cell
+    distances: FlatMap2D[Optional[int]]
+    cost: Optional[int]
+    path: Optional[List[Coords2D]] = None
+
+
+def as_index_grid(costs: Map2D[int]) -> Map2D[int]:
+    """
+    Returns a grid which can be read by flat cell index. Grids which already support that, such as FlatMap2D, are
+    used as they are, other maps are copied into a FlatMap2D.
+    """
+    if hasattr(costs, "get_index_value"):
+        return costs
+    return FlatMap2D.from_map(costs)
+
+
+def neighbour_lookup(grid: Map2D[int], with_diagonals: bool) -> Callable[[int], Sequence[int]]:
+    if hasattr(grid, "neighbour_table"):
+        return grid.neighbour_table(with_diagonals).__getitem__
+    width = grid.width
+    size = grid.size
+
+    def neighbours(index: int) -> List[int]:
+        x = index % width
+        found = []
+        if x > 0:
+            found.append(index - 1)
+        if index >= width:
+            found.append(index - width)
+        if x < width - 1:
+            found.append(index + 1)
+        if index < size - width:
+            found.append(index + width)
+        if with_diagonals:
+            if x > 0 and index >= width:
+                found.append(index - width - 1)
+            if x > 0 and index < size - width:
+                found.append(index + width - 1)
+            if x < width - 1 and index >= width:
+                found.append(index - width + 1)
+            if x < width - 1 and index < size - width:
+                found.append(index + width + 1)
+        return found
+
+    return neighbours
+
+
+def _build_result(
+        grid: Map2D[int],
+        distances: List[Optional[int]],
+        previous: Optional[List[int]],
+        start_index: int,
+        end_index: Optional[int]
+) -> PathResult:
+    distance_map = FlatMap2D(grid.width, grid.height, None)
+    distance_map.cells = distances
+    if end_index is None:
+        return PathResult(distance_map, None)
+    cost = distances[end_index]
+    path = None
+    if previous is not None and cost is not None:
+        path_indexes = [end_index]
+        while path_indexes[-1] != start_index:
+            path_indexes.append(previous[path_indexes[-1]])
+        path = [distance_map.coords_at(index) for index in reversed(path_indexes)]
+    return PathResult(distance_map, cost, path)
+
+
+def dijkstra(
+        costs: Map2D[int],
+        start: Coords2D,
+        end: Optional[Coords2D] = None,
+        with_diagonals: bool = False,
+        with_path: bool = False
+) -> PathResult:
+    """
+    Finds the lowest total cost from start to every cell (or until end is settled, if given), where moving into a
+    cell costs that cell's value. Stale heap entries are skipped when popped, rather than searched for on push.
+    """
+    return a_star(costs, start, end, with_diagonals, with_path, min_step_cost=0)
+
+
+def a_star(
+        costs: Map2D[int],
+        start: Coords2D,
+        end: Optional[Coords2D] = None,
+        with_diagonals: bool = False,
+        with_path: bool = False,
+        min_step_cost: Optional[int] = None
+) -> PathResult:
+    """
+    As dijkstra(), but guided toward end by the manhattan distance multiplied by the cheapest cell cost, which never
+    overestimates the remaining cost. With diagonal moves the heuristic uses the chebyshev distance instead.
+    """
+    grid = as_index_grid(costs)
+    width = grid.width
+    cost_at = grid.get_index_value
+    neighbours = neighbour_lookup(grid, with_diagonals)
+    start_index = grid.index(start)
+    end_index = None if end is None else grid.index(end)
+    if end is None:
+        min_step_cost = 0
+    if min_step_cost is None:
+        min_step_cost = min(cost_at(index) for index in range(grid.size))
+
+    def heuristic(index: int) -> int:
+        if not min_step_cost:
+            return 0
+        y, x = divmod(index, width)
+        if with_diagonals:
+            return max(abs(end.x - x), abs(end.y - y)) * min_step_cost
+        return (abs(end.x - x) + abs(end.y - y)) * min_step_cost
+
+    tentative = [None] * grid.size
+    settled = [None] * grid.size
+    previous = [-1] * grid.size if with_path else None
+    tentative[start_index] = 0
+    queue = [(heuristic(start_index), start_index)]
+    while queue:
+        _, index = heapq.heappop(queue)
+        if settled[index] is not None:
+            continue
+        distance = tentative[index]
+        settled[index] = distance
+        if index == end_index:
+            break
+        for neighbour in neighbours(index):
+            if settled[neighbour] is not None:
+                continue
+            new_distance = distance + cost_at(neighbour)
+            old_distance = tentative[neighbour]
+            if old_distance is None or new_distance < old_distance:
+                tentative[neighbour] = new_distance
+                if previous is not None:
+                    previous[neighbour] = index
+                heapq.heappush(queue, (new_distance + heuristic(neighbour), neighbour))
+    return _build_result(grid, settled, previous, start_index, end_index)
+
+
+def dial(
+        costs: Map2D[int],
+        start: Coords2D,
+        end: Optional[Coords2D] = None,
+        with_diagonals: bool = False,
+        with_path: bool = False,
+        max_step_cost: Optional[int] = None
+) -> PathResult:
+    """
+    Dijkstra's algorithm with a circular array of buckets in place of a heap, for small non-negative integer cell
+    costs, such as single digits. Every tentative distance lies within max_step_cost of the current one, so only
+    max_step_cost + 1 buckets are needed.
+    """
+    grid = as_index_grid(costs)
+    cost_at = grid.get_index_value
+    neighbours = neighbour_lookup(grid, with_diagonals)
+    start_index = grid.index(start)
+    end_index = None if end is None else grid.index(end)
+    if max_step_cost is None:
+        max_step_cost = max(cost_at(index) for index in range(grid.size))
+    num_buckets = max_step_cost + 1
+
+    tentative = [None] * grid.size
+    settled = [None] * grid.size
+    previous = [-1] * grid.size if with_path else None
+    tentative[start_index] = 0
+    buckets: List[List[int]] = [[] for _ in range(num_buckets)]
+    buckets[0].append(start_index)
+    queued = 1
+    distance = 0
+    while queued:
+        bucket = buckets[distance % num_buckets]
+        while bucket:
+            index = bucket.pop()
+            queued -= 1
+            if settled[index] is not None or tentative[index] != distance:
+                continue
+            settled[index] = distance
+            if index == end_index:
+                return _build_result(grid, settled, previous, start_index, end_index)
+            for neighbour in neighbours(index):
+                if settled[neighbour] is not None:
+                    continue
+                new_distance = distance + cost_at(neighbour)
+                old_distance = tentative[neighbour]
+                if old_distance is None or new_distance < old_distance:
+                    tentative[neighbour] = new_distance
+                    if previous is not None:
+                        previous[neighbour] = index
+                    buckets[new_distance % num_buckets].append(neighbour)
+                    queued += 1
+        distance += 1
+    return _build_result(grid, settled, previous, start_index, end_index)
+
+
+def state_search(
+        start: S,
+        moves: Callable[[S], Iterable[Tuple[int, S]]],
+        is_goal: Callable[[S], bool],
+        heuristic: Optional[Callable[[S], int]] = None
+) -> Optional[int]:
+    """
+    A* over states of a puzzle rather than cells of a grid. moves() yields the cost and resulting state of each move
+    from a state, and states must be hashable, as the lowest cost found for each is kept in a table so that states
+    reached again by another route are only searched again if the new route is cheaper. The heuristic must never
+    overestimate the remaining cost, and without one this is Dijkstra's algorithm. Returns the lowest cost to reach a
+    goal state, or None if no goal state can be reached.
+    """
+    best_costs: Dict[S, int] = {start: 0}
+    # The counter breaks ties, so that states themselves are never compared
+    counter = itertools.count()
+    queue = [(heuristic(start) if heuristic else 0, 0, next(counter), start)]
+    while queue:
+        _, cost, _, state = heapq.heappop(queue)
+        if cost > best_costs[state]:
+            continue
+        if is_goal(state):
+            return cost
+        for move_cost, new_state in moves(state):
+            new_cost = cost + move_cost
+            old_cost = best_costs.get(new_state)
+            if old_cost is None or new_cost < old_cost:
+                best_costs[new_state] = new_cost
+                estimate = new_cost + (heuristic(new_state) if heuristic else 0)
+                heapq.heappush(queue, (estimate, new_cost, next(counter), new_state))
+    return None